@@ -1,21 +1,188 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.db.models import Q
+from django.template.response import TemplateResponse
 
+from .constants import BATCH_SIZE
+from .export import export_response
 from .models import Category, Comments, Location, Post
+from .moderation import publish_objects, purge_objects
+from .search import search_posts
+from .services import EstimatedCountPaginator, paginate_by_cursor
 
+CURSOR_VAR = 'cursor'
 
-class CategoryAdmin(admin.ModelAdmin):
+
+class KeysetChangeList(ChangeList):
+    cursor_page = None
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_cursor_query_string(self, cursor):
+        return self.get_query_string({CURSOR_VAR: cursor}, remove=[PAGE_VAR])
+
+    def get_results(self, request):
+        if PAGE_VAR in request.GET or ORDER_VAR in request.GET:
+            return super().get_results(request)
+        self.cursor_page = page = paginate_by_cursor(
+            self.queryset,
+            request.GET.get(CURSOR_VAR),
+            self.list_per_page,
+            field=self.model_admin.keyset_field
+        )
+        self.paginator = EstimatedCountPaginator(
+            self.queryset, self.list_per_page
+        )
+        self.result_count = self.paginator.count
+        self.result_list = page.object_list
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = page.has_other_pages()
+        self.next_query_string = (
+            page.has_next() and self.get_cursor_query_string(page.next_cursor)
+        )
+        self.previous_query_string = (
+            page.has_previous()
+            and self.get_cursor_query_string(page.previous_cursor)
+        )
+        self.first_query_string = (
+            page.has_previous()
+            and self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
+        )
+
+
+class KeysetAdminMixin:
+    keyset_field = None
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+def report_progress(modeladmin, request, progress, message):
+    done = batches = 0
+    for done in progress:
+        batches += 1
+    modeladmin.message_user(
+        request,
+        f'{message}: {done} (пачек по {BATCH_SIZE}: {batches}).',
+        messages.SUCCESS
+    )
+
+
+@admin.action(description='Опубликовать выбранные', permissions=['change'])
+def publish_selected(modeladmin, request, queryset):
+    report_progress(
+        modeladmin, request, publish_objects(queryset, True), 'Опубликовано'
+    )
+
+
+@admin.action(
+    description='Снять с публикации выбранные', permissions=['change']
+)
+def unpublish_selected(modeladmin, request, queryset):
+    report_progress(
+        modeladmin, request, publish_objects(queryset, False),
+        'Снято с публикации'
+    )
+
+
+@admin.action(
+    description='Удалить выбранные без поштучной обработки',
+    permissions=['delete']
+)
+def purge_selected(modeladmin, request, queryset):
+    if request.POST.get('post') != 'yes':
+        return TemplateResponse(
+            request, 'admin/blog/purge_confirmation.html', {
+                **modeladmin.admin_site.each_context(request),
+                'title': 'Удаление выбранных записей',
+                'opts': modeladmin.model._meta,
+                'count': queryset.count(),
+                'selected': request.POST.getlist(ACTION_CHECKBOX_NAME),
+                'select_across': request.POST.get('select_across') == '1',
+                'action_checkbox_name': ACTION_CHECKBOX_NAME,
+            }
+        )
+    report_progress(
+        modeladmin, request, purge_objects(queryset), 'Удалено'
+    )
+
+
+@admin.action(description='Выгрузить выбранные в CSV', permissions=['view'])
+def export_csv(modeladmin, request, queryset):
+    return export_response(queryset, 'csv')
+
+
+@admin.action(
+    description='Выгрузить выбранные в JSONL', permissions=['view']
+)
+def export_jsonl(modeladmin, request, queryset):
+    return export_response(queryset, 'jsonl')
+
+
+class ModerationAdminMixin:
+    actions = (
+        publish_selected, unpublish_selected, purge_selected, export_csv,
+        export_jsonl
+    )
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+
+class AuthorUsernameFilter(admin.SimpleListFilter):
+    title = 'автору'
+    parameter_name = 'author__username'
+    template = 'admin/blog/username_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'parameter_name': self.parameter_name,
+            'hidden_params': [
+                (name, value) for name, value in changelist.params.items()
+                if name != self.parameter_name
+            ],
+            'reset_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+        }
+
+
+class CategoryAdmin(ModerationAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'is_published', 'slug', 'created_at')
     search_fields = ('title', 'description', 'slug')
     list_filter = ('is_published',)
 
 
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(ModerationAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'is_published', 'created_at')
     search_fields = ('name',)
     list_filter = ('is_published',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ModerationAdminMixin, KeysetAdminMixin, admin.ModelAdmin):
+    keyset_field = 'pub_date'
     list_display = (
         'title',
         'author',
@@ -25,13 +192,38 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'created_at')
     search_fields = ('title', 'text', 'author__username')
-    list_filter = ('is_published', 'category', 'location', 'pub_date')
+    list_filter = (
+        'is_published', AuthorUsernameFilter, 'category', 'location',
+        'pub_date'
+    )
+    list_select_related = ('author', 'category', 'location')
+    autocomplete_fields = ('author', 'category', 'location')
 
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(
+            Q(pk__in=search_posts(Post.objects, search_term).values('pk'))
+            | Q(author__username=search_term)
+        ), False
 
-class CommentsAdmin(admin.ModelAdmin):
+
+class CommentsAdmin(
+    ModerationAdminMixin, KeysetAdminMixin, admin.ModelAdmin
+):
+    keyset_field = 'created_at'
+    actions = (purge_selected, export_csv, export_jsonl)
     list_display = ('author', 'post', 'text', 'created_at')
     search_fields = ('text', 'author__username', 'post__title')
-    list_filter = ('author', 'created_at')
+    list_filter = (AuthorUsernameFilter, 'created_at')
+    list_select_related = ('author', 'post')
+    autocomplete_fields = ('author', 'post')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(
+            'post__text', 'post__excerpt'
+        )
 
 
 admin.site.register(Category, CategoryAdmin)
@@ -0,0 +1,268 @@
+import re
+import time
+from bisect import bisect_left, insort
+from threading import Lock, RLock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max, Min
+from django.urls import reverse
+
+from .constants import (
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_LOG_OVERLAP,
+    AUTOCOMPLETE_LOG_SIZE,
+    AUTOCOMPLETE_POLL_INTERVAL,
+    AUTOCOMPLETE_PRUNE_INTERVAL
+)
+from .models import Category, Post, SuggestionChange
+
+User = get_user_model()
+
+WORD_START_RE = re.compile(r'(?<!\w)\w')
+KIND_POST = 'post'
+KIND_CATEGORY = 'category'
+KIND_USER = 'user'
+KIND_RELOAD = 'reload'
+CHANGE_FIELDS = ('pk', 'kind', 'object_id', 'label', 'url_arg', 'is_removed')
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+def get_keys(label):
+    label = normalize(label)
+    return {label[match.start():] for match in WORD_START_RE.finditer(label)}
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.lock = RLock()
+        self.entries = []
+        self.keys = {}
+
+    def add(self, kind, pk, label, url_arg):
+        with self.lock:
+            self.remove(kind, pk)
+            keys = [
+                (key, kind, pk, label, url_arg) for key in get_keys(label)
+            ]
+            for entry in keys:
+                insort(self.entries, entry)
+            self.keys[kind, pk] = keys
+
+    def remove(self, kind, pk):
+        with self.lock:
+            for entry in self.keys.pop((kind, pk), ()):
+                index = bisect_left(self.entries, entry)
+                if index < len(self.entries) and self.entries[index] == entry:
+                    del self.entries[index]
+
+    def search(self, prefix, kinds=None, limit=AUTOCOMPLETE_LIMIT):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found = {}
+        with self.lock:
+            index = bisect_left(self.entries, (prefix,))
+            while len(found) < limit and index < len(self.entries):
+                key, kind, pk, label, url_arg = self.entries[index]
+                if not key.startswith(prefix):
+                    break
+                if kinds is None or kind in kinds:
+                    found.setdefault((kind, pk), (kind, label, url_arg))
+                index += 1
+        return list(found.values())
+
+
+def load_index(index):
+    for pk, title in Post.objects.filter(is_live=True).values_list(
+        'pk', 'title'
+    ).iterator():
+        index.add(KIND_POST, pk, title, pk)
+    for pk, title, slug in Category.objects.filter(
+        is_published=True
+    ).values_list('pk', 'title', 'slug').iterator():
+        index.add(KIND_CATEGORY, pk, title, slug)
+    for pk, username in User.objects.values_list(
+        'pk', 'username'
+    ).iterator():
+        index.add(KIND_USER, pk, username, username)
+    return index
+
+
+def apply_change(index, kind, object_id, label, url_arg, is_removed):
+    if is_removed:
+        index.remove(kind, object_id)
+    elif kind == KIND_POST:
+        index.add(kind, object_id, label, int(url_arg))
+    else:
+        index.add(kind, object_id, label, url_arg)
+
+
+class SharedIndex:
+    """Индекс процесса, догоняющий общий журнал изменений SuggestionChange.
+
+    Процессы читают только новые записи журнала; полная перестройка нужна
+    при первом запросе, после изменений категорий и если процесс отстал
+    дальше, чем хранится журнал.
+    """
+
+    def __init__(self):
+        self.refresh_lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.index = None
+        self.last_change_id = 0
+        self.applied = set()
+        self.checked_at = 0.0
+        self.stale = False
+
+    def get(self):
+        if self.index is None:
+            with self.refresh_lock:
+                if self.index is None:
+                    self.reload()
+        elif self.stale or (
+            time.monotonic() - self.checked_at >= AUTOCOMPLETE_POLL_INTERVAL
+        ):
+            if self.refresh_lock.acquire(blocking=False):
+                try:
+                    self.refresh()
+                finally:
+                    self.refresh_lock.release()
+        return self.index
+
+    def reload(self):
+        last_change_id = SuggestionChange.objects.aggregate(
+            last=Max('pk')
+        )['last'] or 0
+        # Записи, видимые до загрузки, уже учтены в индексе: их не нужно
+        # применять повторно, когда они попадут в окно перекрытия.
+        applied = set(SuggestionChange.objects.filter(
+            pk__gt=last_change_id - AUTOCOMPLETE_LOG_OVERLAP,
+            pk__lte=last_change_id
+        ).values_list('pk', flat=True))
+        self.index = load_index(PrefixIndex())
+        self.last_change_id = last_change_id
+        self.applied = applied
+        self.checked_at = time.monotonic()
+        self.stale = False
+
+    def refresh(self):
+        self.checked_at = time.monotonic()
+        bounds = SuggestionChange.objects.aggregate(
+            first=Min('pk'), last=Max('pk')
+        )
+        first, last = bounds['first'] or 0, bounds['last'] or 0
+        if self.stale or last < self.last_change_id or (
+            self.last_change_id and first > self.last_change_id
+        ):
+            self.reload()
+            return
+        if last == self.last_change_id:
+            return
+        changes = list(SuggestionChange.objects.filter(
+            pk__gt=self.last_change_id - AUTOCOMPLETE_LOG_OVERLAP
+        ).values_list(*CHANGE_FIELDS))
+        if any(
+            kind == KIND_RELOAD and pk not in self.applied
+            for pk, kind, *_ in changes
+        ):
+            self.reload()
+            return
+        self.apply(changes)
+        self.last_change_id = last
+        self.applied = {
+            pk for pk in self.applied
+            if pk > last - AUTOCOMPLETE_LOG_OVERLAP
+        }
+
+    def apply(self, changes):
+        index = self.index
+        if index is None:
+            return
+        with index.lock:
+            for pk, *change in changes:
+                if pk not in self.applied:
+                    apply_change(index, *change)
+                    self.applied.add(pk)
+
+
+shared_index = SharedIndex()
+
+
+def get_index():
+    return shared_index.get()
+
+
+def reset_index():
+    shared_index.reset()
+
+
+def prune_changes(first_id, last_id):
+    if last_id // AUTOCOMPLETE_PRUNE_INTERVAL > (
+        (first_id - 1) // AUTOCOMPLETE_PRUNE_INTERVAL
+    ):
+        SuggestionChange.objects.filter(
+            pk__lte=last_id - AUTOCOMPLETE_LOG_SIZE
+        ).delete()
+
+
+def record_changes(changes):
+    changes = SuggestionChange.objects.bulk_create(changes)
+    if not changes:
+        return
+    prune_changes(changes[0].pk, changes[-1].pk)
+    if any(change.kind == KIND_RELOAD for change in changes):
+        transaction.on_commit(mark_index_stale)
+        return
+    rows = [
+        tuple(getattr(change, field) for field in CHANGE_FIELDS)
+        for change in changes
+    ]
+    transaction.on_commit(lambda: shared_index.apply(rows))
+
+
+def mark_index_stale():
+    shared_index.stale = True
+
+
+def invalidate_index():
+    record_changes([SuggestionChange(kind=KIND_RELOAD)])
+
+
+def update_posts(posts):
+    record_changes([
+        SuggestionChange(
+            kind=KIND_POST, object_id=pk, label=title, url_arg=pk,
+            is_removed=not is_live
+        )
+        for pk, title, is_live in posts
+    ])
+
+
+def update_user(pk, username=None):
+    record_changes([SuggestionChange(
+        kind=KIND_USER, object_id=pk, label=username or '',
+        url_arg=username or '', is_removed=username is None
+    )])
+
+
+def suggest(query, limit=AUTOCOMPLETE_LIMIT):
+    kinds = None
+    if query.startswith('@'):
+        query, kinds = query[1:], (KIND_USER,)
+    suggestions = []
+    for kind, label, url_arg in get_index().search(query, kinds, limit):
+        if kind == KIND_POST:
+            url = reverse('blog:post_detail', args=(url_arg,))
+        elif kind == KIND_CATEGORY:
+            url = reverse('blog:category_posts', args=(url_arg,))
+        else:
+            label = f'@{label}'
+            url = reverse('blog:profile', args=(url_arg,))
+        suggestions.append({'type': kind, 'label': label, 'url': url})
+    return suggestions
@@ -0,0 +1,70 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'blog:version:'
+
+
+def _new_version():
+    return uuid4().hex[:12]
+
+
+def get_versions(*tags):
+    keys = {f'{VERSION_KEY_PREFIX}{tag}': tag for tag in tags}
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_versions(*tags):
+    cache.set_many(
+        {f'{VERSION_KEY_PREFIX}{tag}': _new_version() for tag in tags}, None
+    )
+
+
+def make_key(prefix, *parts, tags=()):
+    versions = get_versions(*tags)
+    return ':'.join(
+        [prefix, *map(str, parts), *(versions[tag] for tag in tags)]
+    )
+
+
+def object_tag(model, pk):
+    return f'{model._meta.model_name}:{pk}'
+
+
+def get_card_tags(post):
+    return (
+        object_tag(post._meta.model, post.pk),
+        object_tag(post._meta.get_field('author').related_model,
+                   post.author_id),
+        object_tag(post._meta.get_field('category').related_model,
+                   post.category_id),
+        object_tag(post._meta.get_field('location').related_model,
+                   post.location_id),
+    )
+
+
+def attach_card_versions(posts):
+    card_tags = {post.pk: get_card_tags(post) for post in posts}
+    versions = get_versions(
+        *{tag for tags in card_tags.values() for tag in tags}
+    )
+    for post in posts:
+        post.card_version = '.'.join(
+            versions[tag] for tag in card_tags[post.pk]
+        )
+    return posts
+
+
+def get_posts_tags(posts):
+    return {tag for post in posts for tag in get_card_tags(post)}
+
+
+def add_cache_tags(request, *tags):
+    if not hasattr(request, 'cache_versions'):
+        return
+    request.cache_versions.update(get_versions(*tags))
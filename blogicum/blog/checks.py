@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CULLED_CACHE_BACKENDS = (
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.db.DatabaseCache',
+)
+CACHE_MIN_ENTRIES = 10000
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    if settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [Warning(
+        'Кеш по умолчанию не общий для процессов сервера.',
+        hint=(
+            'Сброс версий кеша в одном процессе не увидят остальные. '
+            'Настройте в CACHES файловый кеш, Redis или Memcached.'
+        ),
+        id='blog.W001',
+    )]
+
+
+@register()
+def check_cache_entries(app_configs, **kwargs):
+    cache_settings = settings.CACHES['default']
+    if cache_settings['BACKEND'] not in CULLED_CACHE_BACKENDS:
+        return []
+    max_entries = int(
+        cache_settings.get('OPTIONS', {}).get('MAX_ENTRIES', 300)
+    )
+    if max_entries >= CACHE_MIN_ENTRIES:
+        return []
+    return [Warning(
+        f'Кеш по умолчанию хранит не больше {max_entries} записей.',
+        hint=(
+            'При переполнении кеш удаляет случайные записи, в том числе '
+            'версии тегов. Увеличьте OPTIONS.MAX_ENTRIES в CACHES или '
+            'используйте Redis или Memcached.'
+        ),
+        id='blog.W002',
+    )]
@@ -0,0 +1,103 @@
+from functools import wraps
+from hashlib import md5
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .caching import get_versions, object_tag
+from .models import Category, Post
+
+
+def get_latest(*timestamps):
+    return max(
+        (timestamp for timestamp in timestamps if timestamp is not None),
+        default=None
+    )
+
+
+User = get_user_model()
+
+
+def get_posts_last_modified():
+    return Post.objects.aggregate(latest=Max('updated_at'))['latest']
+
+
+def get_index_last_modified(request):
+    return get_posts_last_modified()
+
+
+def get_category_last_modified(request, category_slug):
+    return get_latest(
+        get_posts_last_modified(),
+        Category.objects.filter(slug=category_slug).aggregate(
+            latest=Max('updated_at')
+        )['latest']
+    )
+
+
+def get_profile_last_modified(request, username):
+    return get_posts_last_modified()
+
+
+def get_profile_tags(request, username):
+    return (object_tag(
+        User,
+        User.objects.filter(username=username).values_list(
+            'pk', flat=True
+        ).first()
+    ),)
+
+
+def get_post_last_modified(request, post_id):
+    post = Post.objects.filter(pk=post_id).values_list(
+        'updated_at', 'category__updated_at', 'location__updated_at'
+    ).first()
+    if post is None:
+        return None
+    return get_latest(*post)
+
+
+def condition_on_updates(last_modified_func, *tags, tags_func=None):
+    def get_last_modified(request, *args, **kwargs):
+        if not hasattr(request, 'last_modified'):
+            request.last_modified = last_modified_func(
+                request, *args, **kwargs
+            )
+        return request.last_modified
+
+    def get_etag(request, *args, **kwargs):
+        last_modified = get_last_modified(request, *args, **kwargs)
+        if last_modified is None:
+            return None
+        etag_tags = tags
+        if tags_func is not None:
+            etag_tags += tuple(tags_func(request, *args, **kwargs))
+        versions = get_versions(*etag_tags)
+        # Вход меняет ключ сессии и CSRF-токен: без ключа в ETag 304 вернёт
+        # страницу с формой и устаревшим токеном, и отправка даст 403.
+        return md5(':'.join((
+            request.get_full_path(),
+            str(request.user.pk),
+            request.session.session_key or '',
+            last_modified.isoformat(),
+            *(versions[tag] for tag in etag_tags),
+        )).encode()).hexdigest()
+
+    def decorator(view):
+        view = condition(
+            etag_func=get_etag, last_modified_func=get_last_modified
+        )(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            options = {'no_cache': True}
+            if request.user.is_authenticated:
+                options['private'] = True
+            patch_cache_control(response, **options)
+            return response
+        return wrapper
+
+    return decorator
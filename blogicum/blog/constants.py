@@ -1,3 +1,23 @@
 MAX_LENGTH_CHAR_FIELD = 256
 STR_LIMIT = 20
 PAGINATION_ELEMENTS_COUNT = 10
+COUNT_CACHE_TIMEOUT = 60 * 5
+ESTIMATED_COUNT_LIMIT = 1000
+POSTS_CACHE_TAG = 'posts'
+BATCH_SIZE = 1000
+PAGE_CACHE_TIMEOUT = 60
+PUBLICATION_CLOCK_TICK = 30
+FEED_CACHE_TAG = 'feed'
+EXCERPT_WORDS = 10
+COMMENTS_PAGINATION_COUNT = 20
+CONTENT_DIGEST_LENGTH = 64
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_DEFAULT_WIDTH = 640
+IMAGE_PENDING_TIMEOUT = 60 * 10
+MEDIA_CACHE_CONTROL = 'public, max-age=3600'
+MEDIA_CHUNK_SIZE = 64 * 1024
+AUTOCOMPLETE_POLL_INTERVAL = 1
+AUTOCOMPLETE_LOG_SIZE = 10000
+AUTOCOMPLETE_LOG_OVERLAP = 100
+AUTOCOMPLETE_PRUNE_INTERVAL = 100
+AUTOCOMPLETE_LIMIT = 10
@@ -0,0 +1,45 @@
+from functools import wraps
+from hashlib import md5
+
+from django.core.cache import cache
+
+from .caching import get_versions
+from .constants import PAGE_CACHE_TIMEOUT
+from .services import ensure_scheduled_published, get_publication_clock
+
+PAGE_KEY_PREFIX = 'blog:page:'
+
+
+def publish_scheduled_posts(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        ensure_scheduled_published()
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def cache_page_for_anonymous(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return view(request, *args, **kwargs)
+        key = '{}{}:{}'.format(
+            PAGE_KEY_PREFIX,
+            md5(request.get_full_path().encode()).hexdigest(),
+            int(get_publication_clock().timestamp() * 1000)
+        )
+        entry = cache.get(key)
+        if entry is not None:
+            versions, response = entry
+            if get_versions(*versions) == versions:
+                return response
+        request.cache_versions = {}
+        response = view(request, *args, **kwargs)
+        if (response.status_code == 200 and not response.cookies
+                and request.cache_versions):
+            cache.set(
+                key, (request.cache_versions, response), PAGE_CACHE_TIMEOUT
+            )
+        return response
+    return wrapper
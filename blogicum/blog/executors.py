@@ -0,0 +1,55 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils.module_loading import import_string
+
+DEFAULT_IMAGE_EXECUTOR = 'blog.executors.ThreadExecutor'
+DEFAULT_IMAGE_WORKERS = 2
+
+_executors = {}
+
+
+class ImmediateExecutor:
+    def __init__(self, max_workers=None):
+        pass
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ThreadExecutor:
+    def __init__(self, max_workers=DEFAULT_IMAGE_WORKERS):
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='blog-images'
+        )
+
+    @staticmethod
+    def run(fn, *args, **kwargs):
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    def submit(self, fn, *args, **kwargs):
+        return self.pool.submit(self.run, fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+
+def get_image_executor():
+    path = getattr(settings, 'BLOG_IMAGE_EXECUTOR', DEFAULT_IMAGE_EXECUTOR)
+    workers = getattr(settings, 'BLOG_IMAGE_WORKERS', DEFAULT_IMAGE_WORKERS)
+    if (path, workers) not in _executors:
+        _executors[path, workers] = import_string(path)(max_workers=workers)
+    return _executors[path, workers]
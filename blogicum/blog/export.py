@@ -0,0 +1,103 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .constants import BATCH_SIZE
+from .models import Category, Comments, Location, Post
+
+EXPORT_FIELDS = {
+    Post: (
+        'id', 'title', 'text', 'pub_date', 'author__username',
+        'category__slug', 'location__name', 'is_published', 'is_live',
+        'comment_count', 'created_at', 'updated_at',
+    ),
+    Comments: (
+        'id', 'post_id', 'author__username', 'text', 'created_at',
+    ),
+    Category: (
+        'id', 'title', 'slug', 'description', 'is_published', 'created_at',
+    ),
+    Location: ('id', 'name', 'is_published', 'created_at'),
+}
+EXPORT_LOOKUPS = {
+    Post: {
+        'date': 'pub_date',
+        'category': 'category__slug',
+        'author': 'author__username',
+    },
+    Comments: {
+        'date': 'created_at',
+        'category': 'post__category__slug',
+        'author': 'author__username',
+    },
+    Category: {'date': 'created_at', 'category': 'slug'},
+    Location: {'date': 'created_at'},
+}
+EXPORT_MODELS = {model._meta.model_name: model for model in EXPORT_FIELDS}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def filter_export(queryset, date_from=None, date_to=None, category=None,
+                  author=None):
+    lookups = EXPORT_LOOKUPS[queryset.model]
+    filters = {}
+    if date_from is not None:
+        filters[f'{lookups["date"]}__date__gte'] = date_from
+    if date_to is not None:
+        filters[f'{lookups["date"]}__date__lte'] = date_to
+    for name, value in (('category', category), ('author', author)):
+        if value is None:
+            continue
+        if name not in lookups:
+            raise ValueError(
+                f'Фильтр `{name}` недоступен для модели '
+                f'{queryset.model._meta.model_name}.'
+            )
+        filters[lookups[name]] = value
+    return queryset.filter(**filters)
+
+
+def iter_rows(queryset, chunk_size=BATCH_SIZE):
+    fields = EXPORT_FIELDS[queryset.model]
+    return queryset.order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def render_csv(queryset, chunk_size=BATCH_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS[queryset.model])
+    for row in iter_rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def render_jsonl(queryset, chunk_size=BATCH_SIZE):
+    fields = EXPORT_FIELDS[queryset.model]
+    for row in iter_rows(queryset, chunk_size):
+        yield json.dumps(
+            dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (render_csv, 'text/csv; charset=utf-8'),
+    'jsonl': (render_jsonl, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+def export_response(queryset, export_format):
+    render, content_type = EXPORT_FORMATS[export_format]
+    return StreamingHttpResponse(
+        render(queryset),
+        content_type=content_type,
+        headers={'Content-Disposition': (
+            f'attachment; filename="{queryset.model._meta.model_name}'
+            f'.{export_format}"'
+        )}
+    )
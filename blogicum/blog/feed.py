@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .caching import bump_versions
+from .constants import BATCH_SIZE, FEED_CACHE_TAG
+from .models import FeedEntry, Post
+from .services import get_post_cards
+
+FEED_ENTRY_FIELDS = (
+    'pub_date',
+    'title',
+    'excerpt',
+    'image',
+    'author_username',
+    'category_slug',
+    'category_title',
+    'location_name',
+    'comment_count',
+)
+
+
+def get_location_name(location):
+    if location is None or not location.is_published:
+        return ''
+    return location.name
+
+
+def build_feed_entry(post):
+    return FeedEntry(
+        post=post,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt=post.excerpt,
+        image=post.image,
+        author_username=post.author.username,
+        category_slug=post.category.slug,
+        category_title=post.category.title,
+        location_name=get_location_name(post.location),
+        comment_count=post.comment_count,
+    )
+
+
+def sync_feed(posts):
+    posts = list(get_post_cards(posts))
+    with transaction.atomic():
+        FeedEntry.objects.filter(
+            post__in=[post.pk for post in posts if not post.is_live]
+        ).delete()
+        FeedEntry.objects.bulk_create(
+            [build_feed_entry(post) for post in posts if post.is_live],
+            update_conflicts=True,
+            unique_fields=('post',),
+            update_fields=FEED_ENTRY_FIELDS,
+        )
+    bump_versions(FEED_CACHE_TAG)
+
+
+def sync_feed_in_batches(posts, batch_size=BATCH_SIZE):
+    last_pk = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        sync_feed(Post.objects.filter(pk__in=batch))
+        last_pk = batch[-1]
+
+
+def sync_feed_comment_count(post_id):
+    FeedEntry.objects.filter(pk=post_id).update(comment_count=Subquery(
+        Post.objects.filter(pk=OuterRef('pk')).values('comment_count')
+    ))
+    bump_versions(FEED_CACHE_TAG)
+
+
+def rebuild_feed(batch_size=BATCH_SIZE):
+    with transaction.atomic():
+        while True:
+            batch = list(
+                FeedEntry.objects.values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            FeedEntry.objects.filter(pk__in=batch).delete()
+        sync_feed_in_batches(
+            Post.objects.filter(is_live=True), batch_size
+        )
+    bump_versions(FEED_CACHE_TAG)
+    return FeedEntry.objects.count()
+
+
+def get_feed_entries():
+    return FeedEntry.objects.all()
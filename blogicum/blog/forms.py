@@ -1,7 +1,6 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
-from django.core.exceptions import ValidationError
 
 from .models import Post, Comments
 
@@ -19,18 +18,6 @@ class CreatePost(forms.ModelForm):
                     'type': 'datetime-local'})
         }
 
-    def clean(self):
-        cleaned_data = super().clean()
-        title = cleaned_data.get('title')
-        text = cleaned_data.get('text')
-        category = cleaned_data.get('category')
-        location = cleaned_data.get('location')
-        pub_date = cleaned_data.get('pub_date')
-        if Post.objects.filter(title=title, text=text, category=category,
-                               location=location, pub_date=pub_date).exists():
-            raise ValidationError('Такой пост уже существует')
-        return cleaned_data
-
 
 class ProfileForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,231 @@
+from io import BytesIO
+from pathlib import PurePath
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .caching import bump_versions, object_tag
+from .constants import (
+    FEED_CACHE_TAG,
+    IMAGE_DEFAULT_WIDTH,
+    IMAGE_PENDING_TIMEOUT,
+    IMAGE_VARIANT_WIDTHS
+)
+from .executors import get_image_executor
+from .media import acquire_blob, release_blob
+from .models import FeedEntry, MediaBlob, Post, PostImageVariant
+
+IMAGE_VARIANT_FORMATS = (
+    ('image/jpeg', 'JPEG', 'jpg', {'quality': 85, 'optimize': True}),
+    ('image/webp', 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+)
+IMAGE_METADATA_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp')
+IMAGE_CLEAN_OPTIONS = {'JPEG': {'quality': 95}, 'WEBP': {'quality': 95}}
+IMAGE_VARIANT_FIELDS = (
+    'post', 'source', 'image', 'content_type', 'width', 'height'
+)
+
+
+class Picture:
+    def __init__(self, variants):
+        self.variants = variants
+
+    def get_variants(self, content_type):
+        return [
+            variant for variant in self.variants
+            if variant.content_type == content_type
+        ]
+
+    @property
+    def fallback(self):
+        variants = self.get_variants('image/jpeg')
+        fitting = [
+            variant for variant in variants
+            if variant.width <= IMAGE_DEFAULT_WIDTH
+        ]
+        return (fitting or variants)[-1]
+
+    @staticmethod
+    def get_srcset(variants):
+        return ', '.join(
+            f'{variant.image.url} {variant.width}w' for variant in variants
+        )
+
+    @property
+    def srcset(self):
+        return self.get_srcset(self.get_variants('image/jpeg'))
+
+    @property
+    def webp_srcset(self):
+        return self.get_srcset(self.get_variants('image/webp'))
+
+
+def get_variant_sizes(width, height):
+    widths = sorted({min(size, width) for size in IMAGE_VARIANT_WIDTHS})
+    return [
+        (size, max(1, round(height * size / width))) for size in widths
+    ]
+
+
+def render_variant(image, size, image_format, options):
+    resized = image.resize(size, Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+    buffer = BytesIO()
+    resized.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def build_image_variants(post):
+    try:
+        with post.image.open('rb') as file, Image.open(file) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            stem = PurePath(post.image.name).stem
+            variants = []
+            for width, height in get_variant_sizes(*image.size):
+                for content_type, image_format, extension, options in (
+                    IMAGE_VARIANT_FORMATS
+                ):
+                    variant = PostImageVariant(
+                        post=post,
+                        source=post.image.name,
+                        content_type=content_type,
+                        width=width,
+                        height=height,
+                    )
+                    variant.image.save(
+                        f'{post.pk}/{stem}-{width}.{extension}',
+                        render_variant(
+                            image, (width, height), image_format, options
+                        ),
+                        save=False
+                    )
+                    variants.append(variant)
+            return variants
+    except (OSError, Image.DecompressionBombError):
+        return []
+
+
+def delete_image_variants(variants):
+    PostImageVariant.objects.filter(
+        pk__in=[variant.pk for variant in variants]
+    ).delete()
+
+
+def has_current_variants(post, variants):
+    source = post.image.name or ''
+    return all(
+        variant.source == source for variant in variants
+    ) and bool(variants) == bool(source)
+
+
+def sync_image_variants(post, force=False):
+    variants = list(post.image_variants.only('source', 'image'))
+    if not force and has_current_variants(post, variants):
+        return False
+    with transaction.atomic():
+        delete_image_variants(variants)
+        if post.image:
+            PostImageVariant.objects.bulk_create(build_image_variants(post))
+    return True
+
+
+def render_without_metadata(file):
+    with Image.open(file) as image:
+        if not any(key in image.info for key in IMAGE_METADATA_KEYS):
+            return None
+        image_format = image.format
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        buffer = BytesIO()
+        options = dict(IMAGE_CLEAN_OPTIONS.get(image_format, {}))
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        image.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def delete_orphan_image(storage, name):
+    if not (
+        MediaBlob.objects.filter(name=name).exists()
+        or Post.objects.filter(image=name).exists()
+    ):
+        storage.delete(name)
+
+
+def strip_image_metadata(post):
+    # Оригинал отдаётся по прямой ссылке, поэтому EXIF с координатами и
+    # данными камеры вырезается и из него, а не только из уменьшенных копий.
+    try:
+        with post.image.open('rb') as file:
+            content = render_without_metadata(file)
+    except (OSError, Image.DecompressionBombError):
+        return
+    if content is None:
+        return
+    storage, old = post.image.storage, post.image.name
+    new = storage.save(old, content)
+    if new == old:
+        return
+    with transaction.atomic():
+        replaced = Post.objects.filter(pk=post.pk, image=old).update(
+            image=new
+        )
+        if replaced:
+            acquire_blob(new)
+            release_blob(old)
+            FeedEntry.objects.filter(pk=post.pk).update(image=new)
+    if replaced:
+        post.image.name = new
+    else:
+        delete_orphan_image(storage, new)
+
+
+def get_pending_key(post_id):
+    return f'blog:image-pending:{post_id}'
+
+
+def process_post_image(post_id):
+    try:
+        post = Post.objects.only('pk', 'image').get(pk=post_id)
+        if post.image:
+            strip_image_metadata(post)
+        sync_image_variants(post)
+    except Post.DoesNotExist:
+        pass
+    finally:
+        cache.delete(get_pending_key(post_id))
+        bump_versions(object_tag(Post, post_id), FEED_CACHE_TAG)
+
+
+def schedule_image_processing(post):
+    if has_current_variants(post, list(post.image_variants.only('source'))):
+        return False
+    cache.set(get_pending_key(post.pk), True, IMAGE_PENDING_TIMEOUT)
+    transaction.on_commit(
+        lambda: get_image_executor().submit(process_post_image, post.pk)
+    )
+    return True
+
+
+def attach_pictures(objects):
+    objects = [obj for obj in objects if obj.image]
+    sources = {obj.pk: obj.image.name for obj in objects}
+    variants = {}
+    for variant in PostImageVariant.objects.filter(
+        post__in=sources
+    ).only(*IMAGE_VARIANT_FIELDS).order_by('width'):
+        if variant.source == sources[variant.post_id]:
+            variants.setdefault(variant.post_id, []).append(variant)
+    pending = cache.get_many(
+        [get_pending_key(obj.pk) for obj in objects if obj.pk not in variants]
+    )
+    for obj in objects:
+        if obj.pk in variants:
+            obj.picture = Picture(variants[obj.pk])
+        else:
+            obj.image_pending = get_pending_key(obj.pk) in pending
@@ -0,0 +1,252 @@
+import json
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .autocomplete import invalidate_index
+from .caching import bump_versions
+from .constants import BATCH_SIZE, FEED_CACHE_TAG, POSTS_CACHE_TAG
+from .feed import rebuild_feed
+from .media import recount_blobs
+from .models import Category, Comments, Location, Post
+from .moderation import iter_pk_batches, recount_comments
+from .search import rebuild_search_index
+from .services import make_excerpt
+
+User = get_user_model()
+
+LOAD_MODELS = {
+    model._meta.label_lower: model
+    for model in (User, Category, Location, Post, Comments)
+}
+JSON_READ_SIZE = 64 * 1024
+
+
+class LoadError(ValueError):
+    pass
+
+
+def iter_json_objects(file, read_size=JSON_READ_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    finished = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n[,]':
+            position += 1
+        if position < len(buffer):
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+            else:
+                yield obj
+                continue
+        if finished:
+            return
+        chunk = file.read(read_size)
+        finished = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def get_timestamp_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+class RowBuilder:
+    def __init__(self):
+        self.timestamps = {
+            model: get_timestamp_fields(model)
+            for model in LOAD_MODELS.values()
+        }
+        self.usernames = dict(User.objects.values_list('username', 'pk'))
+        self.digests = set()
+        self.now = timezone.now()
+
+    def resolve(self, field, value):
+        if value is None or not field.is_relation:
+            return field.to_python(value)
+        if isinstance(value, list):
+            if field.related_model is not User:
+                raise LoadError(
+                    f'Натуральный ключ для {field} не поддерживается.'
+                )
+            if value[0] not in self.usernames:
+                raise LoadError(
+                    f'Пользователь {value[0]!r} не найден ни в базе, ни в '
+                    'выгрузке.'
+                )
+            return self.usernames[value[0]]
+        return value
+
+    def build(self, model, record):
+        values = record['fields']
+        obj = model(pk=record.get('pk'))
+        for field in self.timestamps[model]:
+            setattr(obj, field.attname, self.now)
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.name not in values:
+                continue
+            setattr(
+                obj, field.attname, self.resolve(field, values[field.name])
+            )
+        if model is User:
+            self.usernames[obj.username] = obj.pk
+        elif model is Post:
+            self.prepare_post(obj)
+        return obj
+
+    def prepare_post(self, post):
+        post.excerpt = make_excerpt(post.text)
+        post.is_live = False
+        post.comment_count = 0
+        digest = post.get_content_digest()
+        post.content_digest = None if digest in self.digests else digest
+        self.digests.add(digest)
+
+
+def drop_duplicate_digests(posts):
+    taken = set(Post.objects.filter(content_digest__in=[
+        post.content_digest for post in posts if post.content_digest
+    ]).values_list('content_digest', flat=True))
+    for post in posts:
+        if post.content_digest in taken:
+            post.content_digest = None
+
+
+@contextmanager
+def raw_timestamps(models):
+    # Сохраняет даты из выгрузки: bulk_create иначе перезапишет поля
+    # с auto_now и auto_now_add текущим временем.
+    fields = [
+        field for model in models for field in get_timestamp_fields(model)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+@contextmanager
+def dropped_indexes(models):
+    indexes = [
+        (model, index) for model in models for index in model._meta.indexes
+    ]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+def flush(model, rows, ignore_conflicts):
+    if model is Post:
+        drop_duplicate_digests(rows)
+    model.objects.bulk_create(rows, ignore_conflicts=ignore_conflicts)
+
+
+class BulkLoader:
+    def __init__(self, batch_size=BATCH_SIZE, ignore_conflicts=False):
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.builder = RowBuilder()
+        self.pending = {model: [] for model in LOAD_MODELS.values()}
+        self.loaded = dict.fromkeys(LOAD_MODELS.values(), 0)
+        self.skipped = 0
+
+    def flush(self, model):
+        rows = self.pending[model]
+        if rows:
+            flush(model, rows, self.ignore_conflicts)
+            self.loaded[model] += len(rows)
+            rows.clear()
+
+    def add(self, model, record):
+        self.pending[model].append(self.builder.build(model, record))
+        if len(self.pending[model]) < self.batch_size:
+            return False
+        self.flush(model)
+        return True
+
+    def read(self, records, models):
+        for record in records:
+            model = LOAD_MODELS.get(record['model'].lower())
+            if model is None:
+                self.skipped += User not in models
+            elif model in models and self.add(model, record):
+                yield
+
+    def load(self, open_records):
+        # dumpdata пишет blog.* раньше auth.user, поэтому пользователи
+        # загружаются отдельным первым проходом: натуральные ключи авторов
+        # разрешаются без накопления постов и комментариев в памяти.
+        passes = (
+            (User,),
+            tuple(
+                model for model in LOAD_MODELS.values() if model is not User
+            ),
+        )
+        with transaction.atomic(), raw_timestamps(LOAD_MODELS.values()):
+            for models in passes:
+                for _ in self.read(open_records(), models):
+                    yield self.loaded, self.skipped
+                for model in models:
+                    self.flush(model)
+            reset_sequences(
+                [model for model, count in self.loaded.items() if count]
+            )
+        yield self.loaded, self.skipped
+
+
+def iter_file_records(file, read_size=JSON_READ_SIZE):
+    file.seek(0)
+    return iter_json_objects(file, read_size)
+
+
+def load_records(open_records, batch_size=BATCH_SIZE,
+                 ignore_conflicts=False):
+    return BulkLoader(batch_size, ignore_conflicts).load(open_records)
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def refresh_denormalized(batch_size=BATCH_SIZE):
+    now = timezone.now()
+    for batch in iter_pk_batches(Post.objects.all(), batch_size):
+        with transaction.atomic():
+            posts = Post.objects.filter(pk__in=batch)
+            posts.update(is_live=False)
+            posts.filter(
+                is_published=True,
+                pub_date__lte=now,
+                category__is_published=True
+            ).update(is_live=True)
+            recount_comments(batch)
+    rebuild_feed(batch_size)
+    rebuild_search_index()
+    recount_blobs()
+    invalidate_index()
+    bump_versions(POSTS_CACHE_TAG, FEED_CACHE_TAG)
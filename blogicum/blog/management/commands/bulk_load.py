@@ -0,0 +1,74 @@
+import time
+from contextlib import nullcontext
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from blog.constants import BATCH_SIZE
+from blog.loader import (
+    LOAD_MODELS,
+    dropped_indexes,
+    iter_file_records,
+    load_records,
+    refresh_denormalized
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает выгрузку в формате db.json или JSONL через '
+        'bulk_create и пересобирает производные данные.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--drop-indexes', action='store_true',
+            help='Удалить индексы моделей на время загрузки.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки, которые уже есть в базе.'
+        )
+
+    def handle(self, *args, path, batch_size, drop_indexes,
+               ignore_conflicts, **options):
+        started = time.monotonic()
+        total = skipped = 0
+        indexes = (
+            dropped_indexes(LOAD_MODELS.values()) if drop_indexes
+            else nullcontext()
+        )
+        with open(path, encoding='utf-8') as file, indexes:
+            try:
+                for loaded, skipped in load_records(
+                    partial(iter_file_records, file), batch_size,
+                    ignore_conflicts
+                ):
+                    total = sum(loaded.values())
+                    self.stdout.write(
+                        f'Загружено строк: {total} '
+                        f'({self.get_rate(total, started):.0f} строк/с)'
+                    )
+            except (ValueError, IntegrityError) as error:
+                raise CommandError(f'Загрузка отменена: {error}')
+        for model, count in loaded.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        if skipped:
+            self.stdout.write(f'Пропущено записей других моделей: {skipped}')
+        refresh_started = time.monotonic()
+        refresh_denormalized(batch_size)
+        self.stdout.write(
+            'Производные данные пересобраны за '
+            f'{time.monotonic() - refresh_started:.1f} с'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Итого: {total} строк за {time.monotonic() - started:.1f} с '
+            f'({self.get_rate(total, started):.0f} строк/с)'
+        ))
+
+    @staticmethod
+    def get_rate(total, started):
+        return total / max(time.monotonic() - started, 1e-6)
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.constants import BATCH_SIZE
+from blog.media import recount_blobs
+from blog.models import FeedEntry, Post, PostImageVariant
+from blog.storage import get_post_image_storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит изображения постов в хранилище с адресацией по '
+        'содержимому и пересчитывает ссылки на файлы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        storage = get_post_image_storage()
+        posts = Post.objects.exclude(image='').exclude(image=None).exclude(
+            image__startswith=f'{storage.prefix}/'
+        )
+        moved = {}
+        last_pk = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'image')[:batch_size]
+            )
+            if not batch:
+                break
+            for pk, name in batch:
+                if name not in moved:
+                    try:
+                        with storage.open(name) as file:
+                            moved[name] = storage.save(name, file)
+                    except OSError:
+                        continue
+                with transaction.atomic():
+                    Post.objects.filter(pk=pk).update(image=moved[name])
+                    FeedEntry.objects.filter(pk=pk).update(image=moved[name])
+                    PostImageVariant.objects.filter(
+                        post=pk, source=name
+                    ).update(source=moved[name])
+            last_pk = batch[-1][0]
+        referenced = set(
+            Post.objects.filter(image__in=moved).values_list(
+                'image', flat=True
+            )
+        )
+        for name in moved.keys() - referenced:
+            storage.delete(name)
+        blobs = recount_blobs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено файлов: {len(moved)}, уникальных файлов: {blobs}'
+        ))
@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import BATCH_SIZE
+from blog.export import EXPORT_FORMATS, EXPORT_MODELS, filter_export
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает записи блога в CSV или JSONL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(EXPORT_MODELS))
+        parser.add_argument(
+            '--format', choices=sorted(EXPORT_FORMATS), default='jsonl',
+            dest='export_format'
+        )
+        parser.add_argument(
+            '--output', help='Файл для выгрузки, по умолчанию stdout.'
+        )
+        parser.add_argument('--date-from', type=date.fromisoformat)
+        parser.add_argument('--date-to', type=date.fromisoformat)
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--chunk-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, model, export_format, output, date_from,
+               date_to, category, author, chunk_size, **options):
+        try:
+            queryset = filter_export(
+                EXPORT_MODELS[model]._default_manager.all(),
+                date_from, date_to, category, author
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        render, _ = EXPORT_FORMATS[export_format]
+        chunks = render(queryset, chunk_size)
+        if output is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            file.writelines(chunks)
+        self.stderr.write(self.style.SUCCESS(f'Выгрузка сохранена в {output}'))
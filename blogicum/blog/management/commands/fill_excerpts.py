@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.constants import BATCH_SIZE
+from blog.feed import sync_feed
+from blog.models import Post
+from blog.services import make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Заполняет начало текста у публикаций пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--all', action='store_true', dest='recompute_all',
+            help='Пересчитать начало текста у всех публикаций.'
+        )
+
+    def handle(self, *args, batch_size, recompute_all, **options):
+        posts = Post.objects.all()
+        if not recompute_all:
+            posts = posts.filter(excerpt='')
+        last_pk = 0
+        filled = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', 'text', 'is_live')[:batch_size]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt = make_excerpt(post.text)
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ('excerpt',))
+                sync_feed(Post.objects.filter(
+                    pk__in=[post.pk for post in batch if post.is_live]
+                ))
+            filled += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {filled}')
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_versions, object_tag
+from blog.constants import BATCH_SIZE, FEED_CACHE_TAG
+from blog.images import sync_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии и WebP-варианты изображений постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--all', action='store_true', dest='recompute_all',
+            help='Пересоздать варианты у всех изображений.'
+        )
+
+    def handle(self, *args, batch_size, recompute_all, **options):
+        posts = Post.objects.exclude(image='').exclude(image=None)
+        last_pk = 0
+        updated = []
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', 'image')[:batch_size]
+            )
+            if not batch:
+                break
+            updated += [
+                post.pk for post in batch
+                if sync_image_variants(post, force=recompute_all)
+            ]
+            last_pk = batch[-1].pk
+        if updated:
+            bump_versions(
+                FEED_CACHE_TAG, *(object_tag(Post, pk) for pk in updated)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано изображений: {len(updated)}')
+        )
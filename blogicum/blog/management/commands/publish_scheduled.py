@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.constants import PUBLICATION_CLOCK_TICK
+from blog.models import Post
+from blog.services import publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит в ленту отложенные публикации, как только наступает '
+        'их время.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true')
+        parser.add_argument(
+            '--interval', type=float, default=PUBLICATION_CLOCK_TICK
+        )
+
+    def handle(self, *args, once, interval, **options):
+        while True:
+            due = publish_due_posts()
+            if due:
+                self.stdout.write(f'Опубликовано постов: {len(due)}')
+            if once:
+                return
+            time.sleep(self.get_delay(interval))
+
+    def get_delay(self, interval):
+        next_pub_date = Post.objects.filter(
+            is_live=False,
+            is_published=True,
+            category__is_published=True,
+            pub_date__gt=timezone.now(),
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        if next_pub_date is None:
+            return interval
+        return min(
+            interval,
+            max((next_pub_date - timezone.now()).total_seconds(), 0)
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.constants import BATCH_SIZE
+from blog.feed import rebuild_feed
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает материализованную ленту главной страницы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        total = rebuild_feed(batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в ленте: {total}')
+        )
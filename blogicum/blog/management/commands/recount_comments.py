@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.constants import BATCH_SIZE, FEED_CACHE_TAG
+from blog.models import Comments, Post
+from blog.moderation import (
+    bump_object_versions,
+    iter_pk_batches,
+    recount_comments
+)
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчик комментариев у публикаций пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        fixed = 0
+        for batch in iter_pk_batches(Post.objects.all(), batch_size):
+            with transaction.atomic():
+                counts = dict(
+                    Comments.objects.filter(post__in=batch).order_by()
+                    .values_list('post').annotate(total=Count('pk'))
+                )
+                changed = [
+                    pk for pk, comment_count in Post.objects
+                    .select_for_update().filter(pk__in=batch)
+                    .values_list('pk', 'comment_count')
+                    if counts.get(pk, 0) != comment_count
+                ]
+                recount_comments(changed)
+            if changed:
+                bump_object_versions(Post, changed, FEED_CACHE_TAG)
+            fixed += len(changed)
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
@@ -0,0 +1,198 @@
+import mimetypes
+import re
+from collections import Counter
+from pathlib import Path, PurePosixPath
+from stat import S_ISREG
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .constants import MEDIA_CACHE_CONTROL, MEDIA_CHUNK_SIZE
+from .models import MediaBlob, Post
+from .storage import IMMUTABLE_CACHE_CONTROL, get_post_image_storage
+
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+def acquire_blob(name):
+    if not get_post_image_storage().is_content_addressed(name):
+        return
+    MediaBlob.objects.bulk_create(
+        [MediaBlob(name=name)], ignore_conflicts=True
+    )
+    MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+
+def release_blob(name):
+    release_blobs([name])
+
+
+def release_blobs(names):
+    storage = get_post_image_storage()
+    counts = Counter(
+        name for name in names if storage.is_content_addressed(name)
+    )
+    for name, total in counts.items():
+        MediaBlob.objects.filter(name=name).update(
+            refcount=Greatest(F('refcount') - total, 0)
+        )
+    if counts:
+        transaction.on_commit(lambda: [
+            delete_unreferenced_blob(name) for name in counts
+        ])
+
+
+def delete_unreferenced_blob(name):
+    deleted, _ = MediaBlob.objects.filter(name=name, refcount=0).delete()
+    if deleted:
+        get_post_image_storage().delete(name)
+
+
+def recount_blobs():
+    storage = get_post_image_storage()
+    counts = dict(
+        Post.objects.filter(image__startswith=f'{storage.prefix}/')
+        .order_by().values_list('image').annotate(total=Count('pk'))
+    )
+    with transaction.atomic():
+        MediaBlob.objects.bulk_create(
+            [MediaBlob(name=name) for name in counts], ignore_conflicts=True
+        )
+        blobs = list(MediaBlob.objects.select_for_update())
+        for blob in blobs:
+            blob.refcount = counts.get(blob.name, 0)
+        MediaBlob.objects.bulk_update(blobs, ('refcount',))
+    for blob in blobs:
+        if not blob.refcount:
+            delete_unreferenced_blob(blob.name)
+    return len(counts)
+
+
+def get_media_etag(path, stat):
+    storage = get_post_image_storage()
+    if storage.is_content_addressed(path):
+        return f'"{PurePosixPath(path).stem}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    match = RANGE_RE.fullmatch(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end or not int(end):
+            return False
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def if_range_passes(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(file, start, length, chunk_size=MEDIA_CHUNK_SIZE):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def get_content_type(full_path):
+    return (
+        mimetypes.guess_type(full_path.name)[0] or 'application/octet-stream'
+    )
+
+
+def get_offload_response(path, full_path):
+    offload = getattr(settings, 'BLOG_MEDIA_OFFLOAD', None)
+    content_type = get_content_type(full_path)
+    if offload == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(
+            settings, 'BLOG_MEDIA_ACCEL_PREFIX', '/protected-media/'
+        )
+        response['X-Accel-Redirect'] = quote(f'{prefix}{path}')
+    elif offload == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = str(full_path)
+    else:
+        return None
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+        stat = full_path.stat()
+    except (SuspiciousFileOperation, OSError):
+        raise Http404('Файл не найден')
+    if not S_ISREG(stat.st_mode):
+        raise Http404('Файл не найден')
+    etag = get_media_etag(path, stat)
+    last_modified = int(stat.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': (
+            IMMUTABLE_CACHE_CONTROL
+            if get_post_image_storage().is_content_addressed(path)
+            else MEDIA_CACHE_CONTROL
+        ),
+        'Accept-Ranges': 'bytes',
+    }
+    response = (
+        get_conditional_response(request, etag, last_modified)
+        or get_offload_response(path, full_path)
+    )
+    if response is None:
+        byte_range = None
+        if 'Range' in request.headers and if_range_passes(
+            request, etag, last_modified
+        ):
+            byte_range = parse_range(request.headers['Range'], stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(full_path.open('rb'), start, end - start + 1),
+                status=206,
+                content_type=get_content_type(full_path)
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        else:
+            response = FileResponse(full_path.open('rb'))
+    for header, value in headers.items():
+        response.headers.setdefault(header, value)
+    return response
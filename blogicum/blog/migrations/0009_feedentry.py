@@ -0,0 +1,66 @@
+# Generated by Django 5.2 on 2026-10-18 03:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(is_live=True).select_related(
+        'author', 'category', 'location'
+    )
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post=post,
+                pub_date=post.pub_date,
+                title=post.title,
+                excerpt=Truncator(post.text).words(10),
+                image=post.image,
+                author_username=post.author.username,
+                category_slug=post.category.slug,
+                category_title=post.category.title,
+                location_name=(
+                    post.location.name
+                    if post.location and post.location.is_published else ''
+                ),
+                comment_count=post.comment_count,
+            )
+            for post in posts.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_is_live'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Пост')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt', models.TextField(verbose_name='Начало текста')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='', verbose_name='Изображение')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор публикации')),
+                ('category_slug', models.SlugField(verbose_name='Идентификатор категории')),
+                ('category_title', models.CharField(max_length=256, verbose_name='Категория')),
+                ('location_name', models.CharField(blank=True, max_length=256, verbose_name='Местоположение')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date', '-post'),
+                'indexes': [models.Index(fields=['-pub_date', '-post'], name='feed_entry_order_idx')],
+            },
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 03:13
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    batch = []
+    posts = Post.objects.order_by('pk').only('pk', 'text')
+    for post in posts.iterator(chunk_size=1000):
+        post.excerpt = Truncator(post.text).words(10, truncate=' …')
+        batch.append(post)
+        if len(batch) == 1000:
+            Post.objects.bulk_update(batch, ('excerpt',))
+            batch = []
+    Post.objects.bulk_update(batch, ('excerpt',))
+    FeedEntry.objects.update(excerpt=models.Subquery(
+        Post.objects.filter(pk=models.OuterRef('pk')).values('excerpt')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 03:20
+
+import hashlib
+from datetime import timezone
+
+from django.db import migrations, models
+
+
+def make_content_digest(post):
+    digest = hashlib.sha256()
+    pub_date = post.pub_date and post.pub_date.astimezone(timezone.utc)
+    for part in (
+        post.title, post.text, post.category_id, post.location_id, pub_date
+    ):
+        value = '' if part is None else str(part)
+        digest.update(f'{len(value)}:{value}'.encode())
+    return digest.hexdigest()
+
+
+def fill_content_digest(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    seen = set()
+    batch = []
+    for post in Post.objects.order_by('pk').iterator(chunk_size=1000):
+        digest = make_content_digest(post)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        post.content_digest = digest
+        batch.append(post)
+        if len(batch) == 1000:
+            Post.objects.bulk_update(batch, ('content_digest',))
+            batch = []
+    Post.objects.bulk_update(batch, ('content_digest',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='post',
+            name='Unique post',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_digest',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='Отпечаток содержимого'),
+        ),
+        migrations.RunPython(fill_content_digest, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 03:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_content_digest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=256, verbose_name='Исходное изображение')),
+                ('image', models.ImageField(max_length=256, upload_to='variants/', verbose_name='Изображение')),
+                ('content_type', models.CharField(max_length=16, verbose_name='Формат')),
+                ('width', models.PositiveIntegerField(verbose_name='Ширина')),
+                ('height', models.PositiveIntegerField(verbose_name='Высота')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_variants', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'вариант изображения',
+                'verbose_name_plural': 'Варианты изображений',
+                'ordering': ('post', 'content_type', 'width'),
+            },
+        ),
+    ]
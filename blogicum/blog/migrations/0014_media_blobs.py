@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 03:25
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_postimagevariant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('name', models.CharField(max_length=256, unique=True, verbose_name='Файл')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Количество ссылок')),
+            ],
+            options={
+                'verbose_name': 'медиафайл',
+                'verbose_name_plural': 'Медиафайлы',
+                'ordering': ('created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='feedentry',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=blog.storage.get_post_image_storage, upload_to='', verbose_name='Изображение'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=blog.storage.get_post_image_storage, upload_to='', verbose_name='Изображение'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-18 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestionChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveBigIntegerField(null=True, verbose_name='Объект')),
+                ('label', models.CharField(blank=True, max_length=256, verbose_name='Подпись')),
+                ('url_arg', models.CharField(blank=True, max_length=256, verbose_name='Параметр ссылки')),
+                ('is_removed', models.BooleanField(default=False, verbose_name='Удалено')),
+            ],
+            options={
+                'verbose_name': 'изменение подсказок',
+                'verbose_name_plural': 'Журнал подсказок',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -1,11 +1,31 @@
+import hashlib
+from datetime import timezone as dt_timezone
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from .constants import MAX_LENGTH_CHAR_FIELD, STR_LIMIT
+from .constants import (
+    CONTENT_DIGEST_LENGTH,
+    MAX_LENGTH_CHAR_FIELD,
+    STR_LIMIT
+)
+from .storage import get_post_image_storage
 
 User = get_user_model()
 
 
+def make_content_digest(title, text, category_id, location_id, pub_date):
+    if pub_date is not None and timezone.is_aware(pub_date):
+        pub_date = pub_date.astimezone(dt_timezone.utc)
+    digest = hashlib.sha256()
+    for part in (title, text, category_id, location_id, pub_date):
+        value = '' if part is None else str(part)
+        digest.update(f'{len(value)}:{value}'.encode())
+    return digest.hexdigest()
+
+
 class IsPublished(models.Model):
     is_published = models.BooleanField(
         default=True,
@@ -27,7 +47,16 @@ class CreatedAt(models.Model):
         abstract = True
 
 
-class CreatedAtAndIsPublishedAbstract(IsPublished, CreatedAt):
+class UpdatedAt(models.Model):
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name="Изменено"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class CreatedAtAndIsPublishedAbstract(IsPublished, CreatedAt, UpdatedAt):
     class Meta:
         abstract = True
 
@@ -75,6 +104,11 @@ class Post(CreatedAtAndIsPublishedAbstract):
         verbose_name="Заголовок"
     )
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Начало текста"
+    )
     pub_date = models.DateTimeField(
         verbose_name="Дата и время публикации",
         help_text=(
@@ -103,30 +137,78 @@ class Post(CreatedAtAndIsPublishedAbstract):
     )
     image = models.ImageField(
         verbose_name="Изображение",
+        storage=get_post_image_storage,
         null=True,
         blank=True
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев"
+    )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="В ленте"
+    )
+    content_digest = models.CharField(
+        max_length=CONTENT_DIGEST_LENGTH,
+        unique=True,
+        null=True,
+        editable=False,
+        verbose_name="Отпечаток содержимого"
+    )
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
-        constraints = (
-            models.UniqueConstraint(
-                fields=(
-                    "title",
-                    "text",
-                    "category",
-                    "location",
-                    "pub_date"
-                ),
-                name="Unique post"
+        indexes = (
+            models.Index(
+                fields=("-pub_date", "-id"),
+                condition=models.Q(is_live=True),
+                name="post_live_feed_idx"
+            ),
+            models.Index(
+                fields=("category", "-pub_date", "-id"),
+                condition=models.Q(is_live=True),
+                name="post_live_category_feed_idx"
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="post_author_feed_idx"
+            ),
+            models.Index(
+                fields=("pub_date",),
+                condition=models.Q(is_live=False, is_published=True),
+                name="post_scheduled_idx"
+            ),
+            models.Index(
+                fields=("updated_at",),
+                name="post_updated_idx"
+            ),
+            models.Index(
+                fields=("-pub_date", "-id"),
+                name="post_pub_date_idx"
             ),
         )
 
     def __str__(self):
         return self.title[:STR_LIMIT]
 
+    def get_content_digest(self):
+        return make_content_digest(
+            self.title, self.text, self.category_id, self.location_id,
+            self.pub_date
+        )
+
+    def clean(self):
+        super().clean()
+        if Post.objects.filter(
+            content_digest=self.get_content_digest()
+        ).exclude(pk=self.pk).exists():
+            raise ValidationError('Такой пост уже существует')
+
 
 class Comments(CreatedAt):
     text = models.TextField(verbose_name="Комментарий")
@@ -146,6 +228,147 @@ class Comments(CreatedAt):
     class Meta(CreatedAt.Meta):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = (
+            models.Index(
+                fields=("post", "created_at", "id"),
+                name="comment_post_created_idx"
+            ),
+            models.Index(
+                fields=("-created_at", "-id"),
+                name="comment_created_idx"
+            ),
+        )
 
     def __str__(self):
         return self.text[:STR_LIMIT]
+
+
+class PostImageVariant(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name="Пост",
+        related_name="image_variants"
+    )
+    source = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        verbose_name="Исходное изображение"
+    )
+    image = models.ImageField(
+        upload_to="variants/",
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        verbose_name="Изображение"
+    )
+    content_type = models.CharField(
+        max_length=16,
+        verbose_name="Формат"
+    )
+    width = models.PositiveIntegerField(verbose_name="Ширина")
+    height = models.PositiveIntegerField(verbose_name="Высота")
+
+    class Meta:
+        verbose_name = "вариант изображения"
+        verbose_name_plural = "Варианты изображений"
+        ordering = ("post", "content_type", "width")
+
+    def __str__(self):
+        return f"{self.image.name} ({self.width}x{self.height})"
+
+
+class FeedEntry(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name="Пост",
+        related_name="feed_entry"
+    )
+    pub_date = models.DateTimeField(verbose_name="Дата и время публикации")
+    title = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        verbose_name="Заголовок"
+    )
+    excerpt = models.TextField(verbose_name="Начало текста")
+    image = models.ImageField(
+        verbose_name="Изображение",
+        storage=get_post_image_storage,
+        null=True,
+        blank=True
+    )
+    author_username = models.CharField(
+        max_length=150,
+        verbose_name="Автор публикации"
+    )
+    category_slug = models.SlugField(verbose_name="Идентификатор категории")
+    category_title = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        verbose_name="Категория"
+    )
+    location_name = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        blank=True,
+        verbose_name="Местоположение"
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Количество комментариев"
+    )
+
+    class Meta:
+        verbose_name = "запись ленты"
+        verbose_name_plural = "Лента"
+        ordering = ("-pub_date", "-post")
+        indexes = (
+            models.Index(
+                fields=("-pub_date", "-post"),
+                name="feed_entry_order_idx"
+            ),
+        )
+
+    def __str__(self):
+        return self.title[:STR_LIMIT]
+
+
+class MediaBlob(CreatedAt):
+    name = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        unique=True,
+        verbose_name="Файл"
+    )
+    refcount = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Количество ссылок"
+    )
+
+    class Meta(CreatedAt.Meta):
+        verbose_name = "медиафайл"
+        verbose_name_plural = "Медиафайлы"
+
+    def __str__(self):
+        return self.name
+
+
+class SuggestionChange(models.Model):
+    kind = models.CharField(max_length=16, verbose_name="Тип")
+    object_id = models.PositiveBigIntegerField(
+        null=True, verbose_name="Объект"
+    )
+    label = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        blank=True,
+        verbose_name="Подпись"
+    )
+    url_arg = models.CharField(
+        max_length=MAX_LENGTH_CHAR_FIELD,
+        blank=True,
+        verbose_name="Параметр ссылки"
+    )
+    is_removed = models.BooleanField(default=False, verbose_name="Удалено")
+
+    class Meta:
+        verbose_name = "изменение подсказок"
+        verbose_name_plural = "Журнал подсказок"
+        ordering = ("id",)
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,229 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    OuterRef,
+    Subquery,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .autocomplete import invalidate_index, update_posts
+from .caching import bump_versions, object_tag
+from .constants import BATCH_SIZE, FEED_CACHE_TAG, POSTS_CACHE_TAG
+from .feed import sync_feed, sync_feed_in_batches
+from .media import release_blobs
+from .models import (
+    Category,
+    Comments,
+    FeedEntry,
+    Location,
+    Post,
+    PostImageVariant
+)
+from .search import unindex_posts
+
+
+def iter_pk_batches(queryset, batch_size=BATCH_SIZE):
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]
+
+
+def raw_delete(queryset):
+    # Удаляет одним DELETE без загрузки объектов и сигналов: счётчики и
+    # кеши после такого удаления поддерживает вызывающий код.
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_files(storage, names):
+    for name in names:
+        storage.delete(name)
+
+
+def bump_object_versions(model, pks, *tags):
+    bump_versions(*tags, *(object_tag(model, pk) for pk in pks))
+
+
+def recount_comments(post_ids):
+    Post.objects.filter(pk__in=post_ids).update(
+        comment_count=Coalesce(Subquery(
+            Comments.objects.filter(post=OuterRef('pk')).order_by()
+            .values('post').annotate(total=Count('pk')).values('total')
+        ), 0),
+        updated_at=timezone.now()
+    )
+    FeedEntry.objects.filter(pk__in=post_ids).update(comment_count=Subquery(
+        Post.objects.filter(pk=OuterRef('pk')).values('comment_count')
+    ))
+
+
+def publish_posts(queryset, is_published, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        now = timezone.now()
+        posts = Post.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            posts.update(
+                is_published=is_published, is_live=False, updated_at=now
+            )
+            if is_published:
+                posts.filter(
+                    pub_date__lte=now, category__is_published=True
+                ).update(is_live=True)
+            sync_feed(posts)
+            update_posts(list(posts.values_list('pk', 'title', 'is_live')))
+        bump_object_versions(Post, batch, POSTS_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+def purge_posts(queryset, batch_size=BATCH_SIZE):
+    done = 0
+    storage = PostImageVariant._meta.get_field('image').storage
+    for batch in iter_pk_batches(queryset, batch_size):
+        posts = Post.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            images = [
+                name for name in posts.values_list('image', flat=True)
+                if name
+            ]
+            variants = PostImageVariant.objects.filter(post__in=batch)
+            variant_files = list(variants.values_list('image', flat=True))
+            raw_delete(Comments.objects.filter(post__in=batch))
+            raw_delete(FeedEntry.objects.filter(post__in=batch))
+            raw_delete(variants)
+            raw_delete(posts)
+            unindex_posts(batch)
+            update_posts([(pk, '', False) for pk in batch])
+            release_blobs(images)
+            transaction.on_commit(
+                partial(delete_files, storage, variant_files)
+            )
+        bump_object_versions(Post, batch, POSTS_CACHE_TAG, FEED_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+def purge_comments(queryset, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        comments = Comments.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            post_ids = set(comments.values_list('post', flat=True))
+            raw_delete(comments)
+            recount_comments(post_ids)
+        bump_object_versions(Post, post_ids, FEED_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+def publish_categories(queryset, is_published, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        now = timezone.now()
+        posts = Post.objects.filter(category__in=batch)
+        with transaction.atomic():
+            Category.objects.filter(pk__in=batch).update(
+                is_published=is_published, updated_at=now
+            )
+            posts.update(
+                is_live=Case(
+                    When(
+                        is_published=True, pub_date__lte=now,
+                        then=Value(True)
+                    ),
+                    default=Value(False),
+                ) if is_published else Value(False),
+                updated_at=now
+            )
+            sync_feed_in_batches(posts, batch_size)
+            invalidate_index()
+        bump_object_versions(Category, batch, POSTS_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+def purge_categories(queryset, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        with transaction.atomic():
+            raw_delete(FeedEntry.objects.filter(post__category__in=batch))
+            Post.objects.filter(category__in=batch).update(
+                category=None, is_live=False, updated_at=timezone.now()
+            )
+            raw_delete(Category.objects.filter(pk__in=batch))
+            invalidate_index()
+        bump_object_versions(
+            Category, batch, POSTS_CACHE_TAG, FEED_CACHE_TAG
+        )
+        done += len(batch)
+        yield done
+
+
+def publish_locations(queryset, is_published, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        now = timezone.now()
+        with transaction.atomic():
+            Location.objects.filter(pk__in=batch).update(
+                is_published=is_published, updated_at=now
+            )
+            Post.objects.filter(location__in=batch).update(updated_at=now)
+            FeedEntry.objects.filter(post__location__in=batch).update(
+                location_name=Subquery(
+                    Post.objects.filter(pk=OuterRef('pk'))
+                    .values('location__name')
+                ) if is_published else Value('')
+            )
+        bump_object_versions(Location, batch, FEED_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+def purge_locations(queryset, batch_size=BATCH_SIZE):
+    done = 0
+    for batch in iter_pk_batches(queryset, batch_size):
+        with transaction.atomic():
+            FeedEntry.objects.filter(post__location__in=batch).update(
+                location_name=''
+            )
+            Post.objects.filter(location__in=batch).update(
+                location=None, updated_at=timezone.now()
+            )
+            raw_delete(Location.objects.filter(pk__in=batch))
+        bump_object_versions(Location, batch, FEED_CACHE_TAG)
+        done += len(batch)
+        yield done
+
+
+PUBLISHERS = {
+    Post: publish_posts,
+    Category: publish_categories,
+    Location: publish_locations,
+}
+PURGERS = {
+    Post: purge_posts,
+    Comments: purge_comments,
+    Category: purge_categories,
+    Location: purge_locations,
+}
+
+
+def publish_objects(queryset, is_published, batch_size=BATCH_SIZE):
+    return PUBLISHERS[queryset.model](queryset, is_published, batch_size)
+
+
+def purge_objects(queryset, batch_size=BATCH_SIZE):
+    return PURGERS[queryset.model](queryset, batch_size)
@@ -0,0 +1,104 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .constants import PAGINATION_ELEMENTS_COUNT
+from .models import Post
+from .services import paginate_by_cursor
+
+SEARCH_TABLE = 'blog_post_fts'
+SEARCH_TOKEN_RE = re.compile(r'\w+')
+SEARCH_MAX_TOKENS = 10
+
+
+def is_fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def get_search_tokens(query):
+    return SEARCH_TOKEN_RE.findall(query.lower())[:SEARCH_MAX_TOKENS]
+
+
+def make_match_expression(tokens):
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_posts(pks):
+    if not is_fts_available() or not pks:
+        return
+    pks = list(pks)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})',
+            pks
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+            f'SELECT id, title, text FROM {Post._meta.db_table} '
+            f'WHERE id IN ({placeholders})',
+            pks
+        )
+
+
+def unindex_posts(pks):
+    if not is_fts_available() or not pks:
+        return
+    pks = list(pks)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})',
+            pks
+        )
+
+
+def rebuild_search_index():
+    if not is_fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+            f'SELECT id, title, text FROM {Post._meta.db_table}'
+        )
+        return cursor.rowcount
+
+
+def search_posts(queryset, query):
+    tokens = get_search_tokens(query)
+    if not tokens:
+        return queryset.annotate(
+            rank=Value(0.0, output_field=FloatField())
+        ).none()
+    if not is_fts_available():
+        condition = Q()
+        for token in tokens:
+            condition &= Q(title__icontains=token) | Q(text__icontains=token)
+        return queryset.filter(condition).annotate(
+            rank=Value(0.0, output_field=FloatField())
+        )
+    match = make_match_expression(tokens)
+    table = Post._meta.db_table
+    # Индекс присоединяется к постам один раз: MATCH выполняется единожды,
+    # а bm25 считается для уже найденной строки, в том числе в условии
+    # курсора, без коррелированного подзапроса на каждый пост.
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = {table}.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match]
+    ).annotate(rank=RawSQL(
+        f'bm25({SEARCH_TABLE}, 10.0, 1.0)', (), output_field=FloatField()
+    ))
+
+
+def paginate_search_results(queryset, token, count=PAGINATION_ELEMENTS_COUNT):
+    return paginate_by_cursor(
+        queryset, token, count, field='rank', descending=False,
+        parse_value=float
+    )
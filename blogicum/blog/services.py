@@ -1,8 +1,64 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db import connection
+from django.db.models import Q
+from django.dispatch import Signal
 from django.utils import timezone
+from django.utils.text import Truncator
+from django.utils.functional import cached_property
+
+from .caching import bump_versions, make_key, object_tag
+from .constants import (
+    COMMENTS_PAGINATION_COUNT,
+    COUNT_CACHE_TIMEOUT,
+    ESTIMATED_COUNT_LIMIT,
+    EXCERPT_WORDS,
+    PAGINATION_ELEMENTS_COUNT,
+    POSTS_CACHE_TAG,
+    PUBLICATION_CLOCK_TICK
+)
+from .models import Post
+
+posts_published = Signal()
+
+POST_CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'image',
+    'pub_date',
+    'is_published',
+    'is_live',
+    'comment_count',
+    'author',
+    'author__username',
+    'category',
+    'category__slug',
+    'category__title',
+    'category__is_published',
+    'location',
+    'location__name',
+    'location__is_published',
+)
+POST_DETAIL_FIELDS = POST_CARD_FIELDS + ('text',)
+COMMENT_FIELDS = ('text', 'created_at', 'post', 'author', 'author__username')
+CATEGORY_FIELDS = ('title', 'description', 'slug')
+PROFILE_FIELDS = (
+    'username',
+    'first_name',
+    'last_name',
+    'date_joined',
+    'is_staff',
+)
 
-from .constants import PAGINATION_ELEMENTS_COUNT
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+CURSOR_SEPARATOR = '|'
 
 
 def get_select_related(queryset):
@@ -13,21 +69,249 @@ def get_select_related(queryset):
     )
 
 
-def filter_posts_by_publication(queryset):
-    return queryset.filter(
+def get_post_cards(queryset):
+    return get_select_related(queryset).only(*POST_CARD_FIELDS)
+
+
+def get_post_details(queryset):
+    return get_select_related(queryset).only(*POST_DETAIL_FIELDS)
+
+
+def get_post_authors(queryset):
+    return queryset.only('author')
+
+
+def get_comments(post):
+    return post.comments.select_related('author').only(*COMMENT_FIELDS)
+
+
+def get_categories(queryset):
+    return queryset.only(*CATEGORY_FIELDS)
+
+
+def get_profiles(queryset):
+    return queryset.only(*PROFILE_FIELDS)
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def get_publication_clock():
+    now = timezone.now()
+    tick_start = datetime.fromtimestamp(
+        now.timestamp() // PUBLICATION_CLOCK_TICK * PUBLICATION_CLOCK_TICK,
+        tz=dt_timezone.utc
+    )
+    key = make_key(
+        'blog:scheduled', int(tick_start.timestamp()), tags=(POSTS_CACHE_TAG,)
+    )
+    scheduled = cache.get(key)
+    if scheduled is None:
+        scheduled = list(Post.objects.filter(
+            is_live=False,
+            is_published=True,
+            pub_date__gt=tick_start,
+            pub_date__lt=tick_start + timedelta(
+                seconds=PUBLICATION_CLOCK_TICK
+            ),
+        ).order_by('pub_date').values_list('pub_date', flat=True))
+        cache.set(key, scheduled, PUBLICATION_CLOCK_TICK)
+    return max(
+        [tick_start, *(pub_date for pub_date in scheduled if pub_date <= now)]
+    )
+
+
+def ensure_scheduled_published():
+    # Часы переводят в ленту отложенные посты, даже если воркер не запущен:
+    # первый запрос в новом такте публикует всё, что уже наступило.
+    clock = get_publication_clock()
+    if cache.add(
+        f'blog:published:{clock.timestamp()}', True, PUBLICATION_CLOCK_TICK
+    ):
+        publish_due_posts(clock)
+    return clock
+
+
+def publish_due_posts(now=None):
+    due = list(Post.objects.filter(
+        is_live=False,
         is_published=True,
-        pub_date__lte=timezone.now(),
+        pub_date__lte=now or timezone.now(),
         category__is_published=True,
+    ).values_list('pk', flat=True))
+    if due:
+        Post.objects.filter(pk__in=due).update(
+            is_live=True, updated_at=timezone.now()
+        )
+        bump_versions(
+            POSTS_CACHE_TAG, *(object_tag(Post, pk) for pk in due)
+        )
+        posts_published.send(sender=Post, pks=due)
+    return due
+
+
+def filter_posts_by_publication(queryset):
+    return queryset.filter(is_live=True)
+
+
+def sort_posts(queryset):
+    return queryset.order_by('-pub_date')
+
+
+def encode_cursor(direction, value=None, pk=None):
+    parts = [direction]
+    if value is not None:
+        parts += [
+            value.isoformat() if isinstance(value, datetime) else repr(value),
+            str(pk)
+        ]
+    return base64.urlsafe_b64encode(
+        CURSOR_SEPARATOR.join(parts).encode()
+    ).decode().rstrip('=')
+
+
+def decode_cursor(token, parse_value=datetime.fromisoformat):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, *key = raw.decode().split(CURSOR_SEPARATOR)
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+            return None
+        if not key:
+            return direction, None, None
+        value, pk = key
+        return direction, parse_value(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class CursorPage:
+    number = None
+    paginator = None
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None,
+                 first_cursor=None, last_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.first_cursor = first_cursor
+        self.last_cursor = last_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate_by_cursor(queryset, token, count=PAGINATION_ELEMENTS_COUNT,
+                       field='pub_date', descending=True,
+                       parse_value=datetime.fromisoformat):
+    direction, value, pk = decode_cursor(token or '', parse_value) or (
+        CURSOR_NEXT, None, None
+    )
+    backwards = direction == CURSOR_PREVIOUS
+    if backwards == descending:
+        queryset = queryset.order_by(field, 'pk')
+        lookup = 'gt'
+    else:
+        queryset = queryset.order_by(f'-{field}', '-pk')
+        lookup = 'lt'
+    if value is not None:
+        queryset = queryset.filter(
+            Q(**{f'{field}__{lookup}': value})
+            | Q(**{field: value, f'pk__{lookup}': pk})
+        )
+    object_list = list(queryset[:count + 1])
+    has_more = len(object_list) > count
+    object_list = object_list[:count]
+    if backwards:
+        object_list.reverse()
+        has_before, has_after = has_more, value is not None
+    else:
+        has_before, has_after = value is not None, has_more
+    if not object_list:
+        return CursorPage(object_list)
+    first, last = object_list[0], object_list[-1]
+    return CursorPage(
+        object_list,
+        next_cursor=(
+            encode_cursor(CURSOR_NEXT, getattr(last, field), last.pk)
+            if has_after else None
+        ),
+        previous_cursor=(
+            encode_cursor(CURSOR_PREVIOUS, getattr(first, field), first.pk)
+            if has_before else None
+        ),
+        first_cursor=encode_cursor(CURSOR_NEXT) if has_before else None,
+        last_cursor=encode_cursor(CURSOR_PREVIOUS) if has_after else None,
+    )
+
+
+def paginate_comments(post, token):
+    return paginate_by_cursor(
+        get_comments(post), token, COMMENTS_PAGINATION_COUNT,
+        field='created_at', descending=False
     )
 
 
-def annotate_and_sort_posts(queryset):
-    return queryset.annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+def estimate_count(queryset, limit=ESTIMATED_COUNT_LIMIT):
+    if connection.vendor == 'postgresql':
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset.order_by()[:limit].count()
+
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    def get_count(self):
+        return self.object_list.count()
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return self.get_count()
+        key = make_key(
+            'blog:count', *self.count_key,
+            int(get_publication_clock().timestamp() * 1000),
+            tags=(POSTS_CACHE_TAG,)
+        )
+        return cache.get_or_set(key, self.get_count, COUNT_CACHE_TIMEOUT)
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        key = make_key(
+            'blog:estimated-count',
+            self.object_list.model._meta.label_lower,
+            hashlib.md5(str(self.object_list.query).encode()).hexdigest()
+        )
+        return cache.get_or_set(
+            key, lambda: estimate_count(self.object_list), COUNT_CACHE_TIMEOUT
+        )
 
 
-def paginate(queryset, request, count=PAGINATION_ELEMENTS_COUNT):
-    paginator = Paginator(queryset, count)
+def paginate(queryset, request, count=PAGINATION_ELEMENTS_COUNT,
+             cursor=False, count_key=None):
+    if cursor and 'page' not in request.GET:
+        return paginate_by_cursor(queryset, request.GET.get('cursor'), count)
+    paginator = CachedCountPaginator(queryset, count, count_key=count_key)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
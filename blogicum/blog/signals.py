@@ -0,0 +1,318 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .autocomplete import invalidate_index, update_posts, update_user
+from .caching import bump_versions, object_tag
+from .constants import FEED_CACHE_TAG, POSTS_CACHE_TAG
+from .feed import (
+    get_location_name,
+    sync_feed,
+    sync_feed_comment_count,
+    sync_feed_in_batches
+)
+from .images import schedule_image_processing
+from .media import acquire_blob, release_blob
+from .models import (
+    Category,
+    Comments,
+    FeedEntry,
+    Location,
+    Post,
+    PostImageVariant
+)
+from .search import index_posts, unindex_posts
+from .services import make_excerpt, posts_published
+
+User = get_user_model()
+
+CATEGORY_FEED_FIELDS = ('is_published', 'title', 'slug')
+
+
+@receiver((post_save, post_delete), sender=Post)
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_post_counts(**kwargs):
+    bump_versions(POSTS_CACHE_TAG)
+
+
+@receiver(post_save, sender=Comments)
+def increment_comment_count(instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Comments)
+def touch_commented_post(instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+
+
+def is_deleted_with_post(origin):
+    # Комментарии удаляемого поста уходят вместе с ним: счётчики, строку
+    # ленты и версию поста поддерживать незачем.
+    return isinstance(origin, Post) or getattr(origin, 'model', None) is Post
+
+
+@receiver(post_delete, sender=Comments)
+def decrement_comment_count(instance, origin=None, **kwargs):
+    if is_deleted_with_post(origin):
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver((post_save, post_delete), sender=Post)
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Location)
+@receiver((post_save, post_delete), sender=User)
+def invalidate_object_version(sender, instance, update_fields=None,
+                              **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_versions(object_tag(sender, instance.pk))
+
+
+@receiver((post_save, post_delete), sender=Comments)
+def invalidate_commented_post_version(instance, origin=None, **kwargs):
+    if is_deleted_with_post(origin):
+        return
+    bump_versions(object_tag(Post, instance.post_id))
+
+
+@receiver(pre_save, sender=Post)
+def set_post_is_live(instance, **kwargs):
+    instance.is_live = (
+        instance.is_published
+        and instance.pub_date <= timezone.now()
+        and instance.category_id is not None
+        and instance.category.is_published
+    )
+
+
+@receiver(pre_save, sender=Post)
+def set_post_excerpt(instance, **kwargs):
+    instance.excerpt = make_excerpt(instance.text)
+
+
+@receiver(pre_save, sender=Post)
+def set_post_content_digest(instance, **kwargs):
+    instance.content_digest = instance.get_content_digest()
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_state(instance, **kwargs):
+    instance.previous_state = Category.objects.filter(
+        pk=instance.pk
+    ).values(*CATEGORY_FEED_FIELDS).first() if instance.pk else None
+
+
+def category_changed(instance, *fields):
+    previous = getattr(instance, 'previous_state', None)
+    return previous is None or any(
+        previous[field] != getattr(instance, field) for field in fields
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_category_posts_is_live(instance, **kwargs):
+    if not category_changed(instance, 'is_published'):
+        return
+    now = timezone.now()
+    if not instance.is_published:
+        instance.posts.update(is_live=False, updated_at=now)
+        return
+    instance.posts.update(
+        is_live=Case(
+            When(is_published=True, pub_date__lte=now, then=Value(True)),
+            default=Value(False),
+        ),
+        updated_at=now
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(instance, **kwargs):
+    instance.posts.update(is_live=False, updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Post)
+def update_post_feed_entry(instance, **kwargs):
+    sync_feed(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Post)
+def update_post_image_variants(instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    schedule_image_processing(instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_image(instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    instance.previous_image = Post.objects.filter(
+        pk=instance.pk
+    ).values_list('image', flat=True).first() if instance.pk else None
+
+
+@receiver(post_save, sender=Post)
+def count_post_image_references(instance, **kwargs):
+    if not hasattr(instance, 'previous_image'):
+        return
+    previous, current = instance.previous_image, instance.image.name
+    del instance.previous_image
+    if previous == current:
+        return
+    if current:
+        acquire_blob(current)
+    if previous:
+        release_blob(previous)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(instance, **kwargs):
+    if 'image' not in instance.get_deferred_fields() and instance.image:
+        release_blob(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_index(instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'text'} & set(
+        update_fields
+    ):
+        return
+    index_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search_index(instance, **kwargs):
+    unindex_posts([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def update_post_suggestions(instance, **kwargs):
+    update_posts([(instance.pk, instance.title, instance.is_live)])
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_suggestions(instance, **kwargs):
+    update_posts([(instance.pk, instance.title, False)])
+
+
+@receiver(posts_published, sender=Post)
+def add_published_post_suggestions(pks, **kwargs):
+    update_posts(list(
+        Post.objects.filter(pk__in=pks).values_list('pk', 'title', 'is_live')
+    ))
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_suggestions(**kwargs):
+    invalidate_index()
+
+
+@receiver(post_save, sender=User)
+def update_user_suggestions(instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    update_user(instance.pk, instance.username)
+
+
+@receiver(post_delete, sender=User)
+def remove_user_suggestions(instance, **kwargs):
+    update_user(instance.pk)
+
+
+@receiver(post_delete, sender=PostImageVariant)
+def delete_image_variant_file(instance, **kwargs):
+    transaction.on_commit(lambda: instance.image.delete(save=False))
+
+
+@receiver(posts_published, sender=Post)
+def add_published_feed_entries(pks, **kwargs):
+    sync_feed(Post.objects.filter(pk__in=pks))
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_feed(**kwargs):
+    bump_versions(FEED_CACHE_TAG)
+
+
+@receiver((post_save, post_delete), sender=Comments)
+def update_feed_comment_count(instance, origin=None, **kwargs):
+    if is_deleted_with_post(origin):
+        return
+    sync_feed_comment_count(instance.post_id)
+
+
+@receiver(post_save, sender=Category)
+def update_category_feed_entries(instance, **kwargs):
+    if category_changed(instance, 'is_published'):
+        sync_feed_in_batches(instance.posts.all())
+    elif category_changed(instance, 'title', 'slug'):
+        FeedEntry.objects.filter(post__category=instance).update(
+            category_title=instance.title, category_slug=instance.slug
+        )
+        bump_versions(FEED_CACHE_TAG)
+
+
+@receiver(pre_delete, sender=Category)
+def delete_category_feed_entries(instance, **kwargs):
+    FeedEntry.objects.filter(post__category=instance).delete()
+    bump_versions(FEED_CACHE_TAG)
+
+
+@receiver(post_save, sender=Location)
+def update_location_feed_entries(instance, **kwargs):
+    FeedEntry.objects.filter(post__location=instance).update(
+        location_name=get_location_name(instance)
+    )
+    bump_versions(FEED_CACHE_TAG)
+
+
+@receiver(pre_delete, sender=Location)
+def clear_location_feed_entries(instance, **kwargs):
+    FeedEntry.objects.filter(post__location=instance).update(
+        location_name=''
+    )
+    bump_versions(FEED_CACHE_TAG)
+
+
+@receiver(post_save, sender=User)
+def update_author_feed_entries(instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    FeedEntry.objects.filter(post__author=instance).update(
+        author_username=instance.username
+    )
+    bump_versions(FEED_CACHE_TAG)
+
+
+@receiver((post_save, pre_delete), sender=Location)
+def touch_location_posts(instance, **kwargs):
+    instance.posts.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_author_content(instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    Post.objects.filter(
+        Q(author=instance) | Q(comments__author=instance)
+    ).update(updated_at=timezone.now())
@@ -0,0 +1,53 @@
+import hashlib
+from pathlib import PurePosixPath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, prefix='blobs', **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+
+    def get_content_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        digest = digest.hexdigest()
+        extension = PurePosixPath(name).suffix.lower()
+        return (
+            f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+        )
+
+    def is_content_addressed(self, name):
+        return bool(name) and name.startswith(f'{self.prefix}/')
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_content_name(name or content.name, content)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
+
+    def get_available_name(self, name, max_length=None):
+        if not self.is_content_addressed(name):
+            return super().get_available_name(name, max_length)
+        if self.exists(name):
+            raise FileExistsError(name)
+        return name
+
+    def _save(self, name, content):
+        try:
+            return super()._save(name, content)
+        except FileExistsError:
+            return name
+
+
+def get_post_image_storage():
+    return storages['post_images']
@@ -15,6 +15,21 @@ urlpatterns = [
         views.post_detail,
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
+    path(
+        'search/',
+        views.search,
+        name='search'
+    ),
+    path(
+        'autocomplete/',
+        views.autocomplete,
+        name='autocomplete'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.category_posts,
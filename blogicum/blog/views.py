@@ -1,32 +1,70 @@
+from urllib.parse import urlencode
+
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.generic import CreateView
 
+from .autocomplete import suggest
+from .caching import (
+    add_cache_tags,
+    attach_card_versions,
+    get_card_tags,
+    get_posts_tags,
+    object_tag
+)
+from .conditional import (
+    condition_on_updates,
+    get_category_last_modified,
+    get_index_last_modified,
+    get_post_last_modified,
+    get_profile_last_modified,
+    get_profile_tags
+)
+from .constants import FEED_CACHE_TAG, POSTS_CACHE_TAG
+from .decorators import cache_page_for_anonymous, publish_scheduled_posts
+from .feed import get_feed_entries
+from .images import attach_pictures
 from .models import Category, Post, Comments
 from .forms import CreatePost, ProfileForm, CommentForm, RegistrationForm
+from .search import paginate_search_results, search_posts
 from .services import (
-    annotate_and_sort_posts,
     filter_posts_by_publication,
-    get_select_related,
-    paginate
+    get_categories,
+    get_post_authors,
+    get_post_cards,
+    get_post_details,
+    get_profiles,
+    paginate,
+    paginate_comments,
+    sort_posts
 )
 
 
 User = get_user_model()
 
 
+@publish_scheduled_posts
+@condition_on_updates(get_category_last_modified, POSTS_CACHE_TAG)
+@cache_page_for_anonymous
 def category_posts(request, category_slug):
     category = get_object_or_404(
-        Category,
+        get_categories(Category.objects),
         slug=category_slug,
         is_published=True
     )
-    page_obj = paginate(get_select_related(
+    page_obj = paginate(get_post_cards(
         filter_posts_by_publication(
-            annotate_and_sort_posts(category.posts.all())
+            sort_posts(category.posts.all())
         )
-    ), request)
+    ), request, cursor=True, count_key=('category', category.pk))
+    attach_card_versions(page_obj)
+    attach_pictures(page_obj)
+    add_cache_tags(
+        request, POSTS_CACHE_TAG, object_tag(Category, category.pk),
+        *get_posts_tags(page_obj)
+    )
     return render(
         request,
         'blog/category.html',
@@ -37,16 +75,62 @@ def category_posts(request, category_slug):
     )
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(get_select_related(Post.objects), pk=post_id)
+@publish_scheduled_posts
+@cache_page_for_anonymous
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_obj = paginate_search_results(
+        search_posts(
+            get_post_cards(filter_posts_by_publication(Post.objects)), query
+        ),
+        request.GET.get('cursor')
+    )
+    attach_card_versions(page_obj)
+    attach_pictures(page_obj)
+    add_cache_tags(request, POSTS_CACHE_TAG, *get_posts_tags(page_obj))
+    return render(
+        request,
+        'blog/search.html',
+        {
+            'page_obj': page_obj,
+            'query': query,
+            'page_query': urlencode({'q': query}) + '&',
+        }
+    )
+
+
+def autocomplete(request):
+    return JsonResponse(
+        {'suggestions': suggest(request.GET.get('q', '').strip())}
+    )
+
+
+def get_visible_post(request, post_id, get_queryset=get_post_details):
+    post = get_object_or_404(get_queryset(Post.objects), pk=post_id)
     if request.user != post.author:
         post = get_object_or_404(
-            get_select_related(
-                filter_posts_by_publication(Post.objects)
-            ),
+            get_queryset(filter_posts_by_publication(Post.objects)),
             pk=post_id
         )
-    comments = post.comments.select_related('author')
+    return post
+
+
+def add_comments_cache_tags(request, comments):
+    add_cache_tags(
+        request,
+        *{object_tag(User, comment.author_id) for comment in comments}
+    )
+
+
+@publish_scheduled_posts
+@condition_on_updates(get_post_last_modified)
+@cache_page_for_anonymous
+def post_detail(request, post_id):
+    post = get_visible_post(request, post_id)
+    attach_pictures([post])
+    comments = paginate_comments(post, request.GET.get('comments'))
+    add_cache_tags(request, *get_card_tags(post))
+    add_comments_cache_tags(request, comments)
     form = CommentForm()
     return render(
         request,
@@ -55,12 +139,30 @@ def post_detail(request, post_id):
     )
 
 
+@publish_scheduled_posts
+@condition_on_updates(get_post_last_modified)
+@cache_page_for_anonymous
+def post_comments(request, post_id):
+    post = get_visible_post(request, post_id, get_post_authors)
+    comments = paginate_comments(post, request.GET.get('cursor'))
+    add_cache_tags(request, object_tag(Post, post.pk))
+    add_comments_cache_tags(request, comments)
+    return render(
+        request,
+        'includes/comments.html',
+        {'post': post, 'comments': comments, 'is_fragment': True},
+    )
+
+
+@publish_scheduled_posts
+@condition_on_updates(get_index_last_modified, FEED_CACHE_TAG)
+@cache_page_for_anonymous
 def index(request):
-    page_obj = paginate(get_select_related(
-        filter_posts_by_publication(
-            annotate_and_sort_posts(Post.objects.all())
-        )
-    ), request)
+    page_obj = paginate(
+        get_feed_entries(), request, cursor=True, count_key=('index',)
+    )
+    attach_pictures(page_obj)
+    add_cache_tags(request, FEED_CACHE_TAG)
     return render(
         request,
         'blog/index.html',
@@ -68,14 +170,30 @@ def index(request):
     )
 
 
+@publish_scheduled_posts
+@condition_on_updates(
+    get_profile_last_modified, POSTS_CACHE_TAG, tags_func=get_profile_tags
+)
+@cache_page_for_anonymous
 def profile_view(request, username):
-    profile = get_object_or_404(User, username=username)
-    post_list = get_select_related(
-        annotate_and_sort_posts(profile.posts.all())
+    profile = get_object_or_404(
+        get_profiles(User.objects), username=username
+    )
+    post_list = get_post_cards(
+        sort_posts(profile.posts.all())
     )
-    if request.user != profile:
+    is_owner = request.user == profile
+    if not is_owner:
         post_list = filter_posts_by_publication(post_list)
-    page_obj = paginate(post_list, request)
+    page_obj = paginate(
+        post_list, request, count_key=('profile', profile.pk, is_owner)
+    )
+    attach_card_versions(page_obj)
+    attach_pictures(page_obj)
+    add_cache_tags(
+        request, POSTS_CACHE_TAG, object_tag(User, profile.pk),
+        *get_posts_tags(page_obj)
+    )
     return render(request, 'blog/profile.html',
                   {'profile': profile, 'page_obj': page_obj})
 
@@ -18,6 +18,43 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 MEDIA_URL = '/media/'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'post_images': {
+        'BACKEND': 'blog.storage.ContentAddressedStorage',
+        'OPTIONS': {'prefix': 'images'},
+    },
+}
+
+# Версии тегов кеша должны быть видны всем процессам сервера, поэтому
+# локальный LocMemCache не подходит. Файловый кеш общий для процессов
+# одного хоста; при нескольких хостах нужен Redis или Memcached.
+# Файловый кеш при переполнении удаляет случайную часть записей, включая
+# версии тегов, поэтому лимит заведомо выше числа ключей ленты и карточек.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
+BLOG_MEDIA_OFFLOAD = None
+
+BLOG_MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+BLOG_IMAGE_EXECUTOR = 'blog.executors.ThreadExecutor'
+
+BLOG_IMAGE_WORKERS = 2
+
 INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
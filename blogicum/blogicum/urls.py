@@ -1,8 +1,10 @@
+import re
+
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 
+from blog.media import serve_media
 from blog.views import UserCreateView
 
 urlpatterns = [
@@ -11,6 +13,11 @@ urlpatterns = [
     path('pages/', include('pages.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', UserCreateView.as_view(), name='registration'),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(
+        rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.*)$',
+        serve_media,
+        name='media'
+    ),
+]
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.internal_server_error'
@@ -92,6 +92,9 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.cache",
+    "fixtures.executors",
+    "fixtures.media",
     "adapters.comment",
 ]
 
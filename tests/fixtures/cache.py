@@ -0,0 +1,16 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+
+@pytest.fixture(scope="session", autouse=True)
+def shared_cache(tmp_path_factory):
+    location = tmp_path_factory.mktemp("cache")
+    with override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+            "OPTIONS": settings.CACHES["default"].get("OPTIONS", {}),
+        },
+    }):
+        yield location
@@ -0,0 +1,12 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture(autouse=True)
+def process_images_inline():
+    # Потоки-обработчики пишут в общую SQLite-базу в памяти и ловят
+    # «table is locked», поэтому в тестах изображения обрабатываются сразу.
+    with override_settings(
+        BLOG_IMAGE_EXECUTOR="blog.executors.ImmediateExecutor"
+    ):
+        yield
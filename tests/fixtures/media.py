@@ -0,0 +1,16 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_media_root(tmp_path_factory):
+    # Загрузки и уменьшенные копии не должны оставаться в blogicum/media.
+    location = tmp_path_factory.mktemp("media")
+    with override_settings(MEDIA_ROOT=location):
+        yield location
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
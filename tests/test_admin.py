@@ -0,0 +1,146 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blend_content(mixer):
+    def blend(count):
+        users = mixer.cycle(count).blend("auth.User")
+        categories = mixer.cycle(count).blend(
+            "blog.Category", is_published=True
+        )
+        locations = mixer.cycle(count).blend("blog.Location")
+        posts = mixer.cycle(count).blend(
+            "blog.Post",
+            author=(user for user in users),
+            category=(category for category in categories),
+            location=(location for location in locations),
+        )
+        mixer.cycle(count).blend(
+            "blog.Comments",
+            author=(user for user in users),
+            post=(post for post in posts),
+        )
+        return posts
+
+    return blend
+
+
+def count_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(queries.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/admin/blog/post/",
+        "/admin/blog/comments/",
+        "/admin/blog/post/add/",
+        "/admin/blog/comments/add/",
+    ],
+)
+def test_admin_pages_use_constant_queries(admin_client, blend_content, url):
+    blend_content(3)
+    count_queries(admin_client, url)
+    expected = count_queries(admin_client, url)
+    blend_content(30)
+    assert count_queries(admin_client, url) == expected, (
+        f"Убедитесь, что число запросов страницы `{url}` не зависит от"
+        " количества записей."
+    )
+
+
+def test_author_filter_does_not_list_users(admin_client, blend_content):
+    posts = blend_content(5)
+    username = posts[0].author.username
+    response = admin_client.get("/admin/blog/comments/")
+    content = response.content.decode()
+    assert username not in content.split('id="changelist-filter"')[-1], (
+        "Убедитесь, что фильтр по автору не перечисляет всех пользователей."
+    )
+    response = admin_client.get(
+        "/admin/blog/comments/", {"author__username": username}
+    )
+    result = response.context["cl"].result_list
+    assert [comment.author.username for comment in result] == [username]
+
+
+def test_changelist_skips_exact_count(admin_client, blend_content):
+    blend_content(3)
+    admin_client.get("/admin/blog/comments/")
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get("/admin/blog/comments/")
+    assert response.status_code == 200
+    assert not [
+        query for query in queries.captured_queries
+        if "COUNT(" in query["sql"]
+    ], "Убедитесь, что список в админке не считает записи при каждом запросе."
+
+
+def test_changelist_uses_keyset_navigation(
+    admin_client, blend_content, monkeypatch
+):
+    from blog.admin import CommentsAdmin
+
+    monkeypatch.setattr(CommentsAdmin, "list_per_page", 3)
+    blend_content(7)
+    cl = admin_client.get("/admin/blog/comments/").context["cl"]
+    expected = list(
+        cl.model.objects.order_by("-created_at", "-pk")
+        .values_list("pk", flat=True)
+    )
+    seen = []
+    url = "/admin/blog/comments/"
+    query = ""
+    while True:
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url + query)
+        cl = response.context["cl"]
+        assert cl.cursor_page is not None, (
+            "Убедитесь, что список комментариев в админке листается по"
+            " курсору."
+        )
+        assert not [
+            item for item in queries.captured_queries
+            if "OFFSET" in item["sql"]
+        ], "Убедитесь, что навигация по курсору не использует OFFSET."
+        seen.extend(comment.pk for comment in cl.result_list)
+        if not cl.next_query_string:
+            break
+        query = cl.next_query_string
+    assert seen == expected, (
+        "Убедитесь, что навигация по курсору проходит все комментарии от"
+        " новых к старым."
+    )
+
+
+def test_changelist_keeps_page_numbers(admin_client, blend_content):
+    blend_content(3)
+    response = admin_client.get("/admin/blog/post/", {"p": 1})
+    assert response.status_code == 200
+    assert response.context["cl"].cursor_page is None
+
+
+def test_numbered_fallback_reaches_every_page(
+    admin_client, blend_content, monkeypatch
+):
+    from blog import services
+    from blog.admin import CommentsAdmin
+
+    monkeypatch.setattr(CommentsAdmin, "list_per_page", 2)
+    monkeypatch.setattr(services.estimate_count, "__defaults__", (2,))
+    blend_content(7)
+    response = admin_client.get("/admin/blog/comments/", {"o": "1", "p": 4})
+    assert response.status_code == 200
+    cl = response.context["cl"]
+    assert cl.result_count == 7, (
+        "Убедитесь, что нумерованная пагинация в админке считает записи"
+        " точно."
+    )
+    assert len(cl.result_list) == 1
@@ -0,0 +1,139 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    from blog.autocomplete import reset_index
+
+    monkeypatch.setattr("blog.autocomplete.AUTOCOMPLETE_POLL_INTERVAL", 60)
+    reset_index()
+
+
+@pytest.fixture
+def blend_post(mixer, user, published_category):
+    def blend(title, **kwargs):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        fields.update(kwargs)
+        return mixer.blend("blog.Post", title=title, **fields)
+
+    return blend
+
+
+def get_labels(client, query):
+    response = client.get("/autocomplete/", {"q": query})
+    assert response.status_code == 200
+    return {item["label"] for item in response.json()["suggestions"]}
+
+
+def test_suggestions(client, blend_post, user, published_category):
+    blend_post("Горные вершины Кавказа")
+    blend_post("Горячий шоколад", is_published=False)
+    published_category.title = "Горы"
+    published_category.save()
+    assert get_labels(client, "гор") == {"Горные вершины Кавказа", "Горы"}, (
+        "Убедитесь, что подсказки содержат опубликованные посты и категории."
+    )
+    assert get_labels(client, "верш") == {"Горные вершины Кавказа"}
+    assert get_labels(client, f"@{user.username[:3]}") == {
+        f"@{user.username}"
+    }, "Убедитесь, что по `@` подсказываются имена пользователей."
+
+
+def test_warm_index_does_not_query_database(client, blend_post):
+    blend_post("Озеро Байкал")
+    get_labels(client, "оз")
+    with CaptureQueriesContext(connection) as queries:
+        assert get_labels(client, "озеро б") == {"Озеро Байкал"}
+    assert not queries.captured_queries, (
+        "Убедитесь, что подсказки отдаются из памяти, без запросов к базе."
+    )
+
+
+def test_index_is_updated_incrementally(
+    client, blend_post, django_capture_on_commit_callbacks
+):
+    get_labels(client, "x")
+    with django_capture_on_commit_callbacks(execute=True):
+        post = blend_post("Новый пост")
+    with CaptureQueriesContext(connection) as queries:
+        assert get_labels(client, "нов") == {"Новый пост"}
+    assert not queries.captured_queries, (
+        "Убедитесь, что индекс подсказок обновляется без полной перестройки."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert get_labels(client, "нов") == set()
+
+
+def test_changes_from_other_processes_are_applied(
+    client, blend_post, monkeypatch
+):
+    from blog.models import SuggestionChange
+
+    post = blend_post("Старое название")
+    get_labels(client, "x")
+    # Запись журнала без локального применения: так индекс видит изменения,
+    # сделанные другим процессом.
+    SuggestionChange.objects.create(
+        kind="post", object_id=post.pk, label="Свежее название",
+        url_arg=post.pk
+    )
+    monkeypatch.setattr("blog.autocomplete.AUTOCOMPLETE_POLL_INTERVAL", 0)
+    with CaptureQueriesContext(connection) as queries:
+        assert get_labels(client, "свеж") == {"Свежее название"}, (
+            "Убедитесь, что индекс подсказок догоняет общий журнал изменений."
+        )
+    assert not any(
+        "blog_post" in query["sql"] for query in queries.captured_queries
+    ), "Убедитесь, что изменения из журнала применяются без перестройки."
+
+
+def test_category_change_rebuilds_index(
+    client, blend_post, published_category, monkeypatch
+):
+    blend_post("Морской берег")
+    get_labels(client, "x")
+    published_category.title = "Моря"
+    published_category.save()
+    monkeypatch.setattr("blog.autocomplete.AUTOCOMPLETE_POLL_INTERVAL", 0)
+    assert get_labels(client, "мор") == {"Морской берег", "Моря"}
+
+
+def test_change_log_is_pruned(monkeypatch):
+    from blog.autocomplete import update_posts
+    from blog.models import SuggestionChange
+
+    monkeypatch.setattr("blog.autocomplete.AUTOCOMPLETE_LOG_SIZE", 5)
+    monkeypatch.setattr("blog.autocomplete.AUTOCOMPLETE_PRUNE_INTERVAL", 2)
+    for pk in range(1, 21):
+        update_posts([(pk, f"Пост {pk}", True)])
+    assert SuggestionChange.objects.count() <= 7, (
+        "Убедитесь, что старые записи журнала подсказок удаляются."
+    )
+
+
+def test_lookup_is_fast():
+    from blog.autocomplete import PrefixIndex
+
+    index = PrefixIndex()
+    for pk in range(20000):
+        index.add("post", pk, f"Заметка номер {pk} о путешествиях", pk)
+    timings = []
+    for pk in range(1000):
+        start = time.perf_counter()
+        index.search(f"заметка номер {pk}")
+        timings.append(time.perf_counter() - start)
+    assert sorted(timings)[int(len(timings) * 0.99)] < 0.001
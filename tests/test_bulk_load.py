@@ -0,0 +1,160 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_bulk_load_matches_fixture():
+    from blog.models import Category, FeedEntry, Location, Post
+
+    records = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    out = io.StringIO()
+    call_command("bulk_load", str(DB_JSON), "--drop-indexes", stdout=out)
+    assert "строк/с" in out.getvalue(), (
+        "Убедитесь, что команда `bulk_load` сообщает скорость загрузки."
+    )
+    expected = {
+        model: sorted(
+            record["pk"] for record in records
+            if record["model"] == model._meta.label_lower
+        )
+        for model in (Category, Location, Post)
+    }
+    for model, pks in expected.items():
+        assert sorted(model.objects.values_list("pk", flat=True)) == pks
+    post = Post.objects.get(pk=1)
+    assert post.created_at.isoformat().startswith("2022-12-18"), (
+        "Убедитесь, что загрузка сохраняет даты из выгрузки."
+    )
+    assert post.excerpt and post.content_digest
+    assert FeedEntry.objects.count() == Post.objects.filter(
+        is_live=True
+    ).count() > 0, "Убедитесь, что после загрузки пересобирается лента."
+
+
+def test_bulk_load_reads_jsonl(tmp_path, mixer):
+    user = mixer.blend("auth.User")
+    category = mixer.blend("blog.Category", is_published=True)
+    path = tmp_path / "posts.jsonl"
+    path.write_text("\n".join(json.dumps({
+        "model": "blog.post",
+        "pk": 100 + index,
+        "fields": {
+            "title": f"Пост {index}",
+            "text": "Текст",
+            "pub_date": "2020-01-01T00:00:00Z",
+            "is_published": True,
+            "author": [user.username],
+            "category": category.pk,
+            "location": None,
+        },
+    }) for index in range(3)), encoding="utf-8")
+    call_command(
+        "bulk_load", str(path), "--batch-size", "2", stdout=io.StringIO()
+    )
+    from blog.models import Post
+
+    assert list(
+        Post.objects.filter(is_live=True).order_by("pk")
+        .values_list("pk", "author")
+    ) == [(100, user.pk), (101, user.pk), (102, user.pk)]
+
+
+def write_jsonl(path, records):
+    path.write_text(
+        "\n".join(json.dumps(record) for record in records), encoding="utf-8"
+    )
+
+
+def make_post_record(pk, username, category):
+    return {
+        "model": "blog.post",
+        "pk": pk,
+        "fields": {
+            "title": f"Пост {pk}",
+            "text": "Текст",
+            "pub_date": "2020-01-01T00:00:00Z",
+            "is_published": True,
+            "author": [username],
+            "category": category.pk,
+            "location": None,
+        },
+    }
+
+
+def test_bulk_load_resolves_users_listed_after_posts(tmp_path, mixer):
+    from blog.models import Post
+
+    category = mixer.blend("blog.Category", is_published=True)
+    path = tmp_path / "snapshot.jsonl"
+    write_jsonl(path, [
+        make_post_record(200, "late_author", category),
+        {
+            "model": "auth.user",
+            "pk": 50,
+            "fields": {"username": "late_author", "password": "!"},
+        },
+    ])
+    call_command("bulk_load", str(path), stdout=io.StringIO())
+    assert Post.objects.get(pk=200).author.username == "late_author", (
+        "Убедитесь, что натуральные ключи пользователей разрешаются, даже"
+        " если пользователь идёт в выгрузке после поста."
+    )
+
+
+def test_bulk_load_reports_unknown_user(tmp_path, mixer):
+    from django.core.management.base import CommandError
+
+    from blog.models import Post
+
+    category = mixer.blend("blog.Category", is_published=True)
+    path = tmp_path / "snapshot.jsonl"
+    write_jsonl(path, [make_post_record(300, "nobody", category)])
+    with pytest.raises(CommandError, match="nobody"):
+        call_command("bulk_load", str(path), stdout=io.StringIO())
+    assert not Post.objects.exists()
+
+
+def test_bulk_load_reports_pk_collision(tmp_path, user):
+    from django.core.management.base import CommandError
+
+    path = tmp_path / "snapshot.jsonl"
+    write_jsonl(path, [{
+        "model": "auth.user",
+        "pk": user.pk,
+        "fields": {"username": "someone_else", "password": "!"},
+    }])
+    with pytest.raises(CommandError, match="Загрузка отменена"):
+        call_command("bulk_load", str(path), stdout=io.StringIO())
+
+
+def test_bulk_load_does_not_hold_posts_of_later_users(mixer):
+    from blog.loader import load_records
+    from blog.models import Post
+
+    category = mixer.blend("blog.Category", is_published=True)
+    loaded_before_user = []
+
+    def open_records():
+        for pk in (400, 401, 402):
+            yield make_post_record(pk, "streamed_author", category)
+        loaded_before_user.append(Post.objects.count())
+        yield {
+            "model": "auth.user",
+            "pk": 60,
+            "fields": {"username": "streamed_author", "password": "!"},
+        }
+
+    for _ in load_records(open_records, batch_size=1):
+        pass
+    assert Post.objects.count() == 3
+    assert loaded_before_user[-1] >= 2, (
+        "Убедитесь, что посты пользователей из конца выгрузки записываются"
+        " по ходу чтения, а не копятся в памяти."
+    )
@@ -0,0 +1,115 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_cache_invalidation(client, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode("utf-8")
+
+    for obj, field, value in (
+        (post, "title", "Новый заголовок"),
+        (post.category, "title", "Новая категория"),
+        (post.location, "name", "Новое место"),
+        (post.author, "username", "new_author"),
+    ):
+        setattr(obj, field, value)
+        obj.save()
+        assert value in client.get("/").content.decode("utf-8"), (
+            "Убедитесь, что карточка поста перерисовывается после изменения"
+            f" поля `{field}` модели `{type(obj).__name__}`."
+        )
+
+
+def test_post_card_shows_new_comment_count(
+    client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    mixer.blend("blog.Comments", post=post)
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8")
+
+
+def test_post_card_is_served_from_cache(
+    user_client, post_with_published_location
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    url = f"/profile/{post.author.username}/"
+    user_client.get(url)
+    Post.objects.filter(pk=post.pk).update(text="Текст без сигнала")
+    assert "Текст без сигнала" not in user_client.get(url).content.decode(
+        "utf-8"
+    ), "Убедитесь, что карточки постов кешируются."
+
+
+def test_anonymous_page_cache(
+    client, user_client, post_with_published_location
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    client.get(f"/posts/{post.pk}/")
+    Post.objects.filter(pk=post.pk).update(text="Текст без сигнала")
+    assert "Текст без сигнала" not in client.get(
+        f"/posts/{post.pk}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что страницы для анонимных пользователей кешируются."
+    )
+    assert "Текст без сигнала" in user_client.get(
+        f"/posts/{post.pk}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что авторизованные пользователи получают страницу"
+        " в обход кеша."
+    )
+
+
+def test_anonymous_page_cache_invalidation(
+    client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get(f"/posts/{post.pk}/")
+    comment = mixer.blend("blog.Comments", post=post, text="Новый комментарий")
+    assert comment.text in client.get(f"/posts/{post.pk}/").content.decode(
+        "utf-8"
+    )
+    comment.author.username = "renamed_commenter"
+    comment.author.save()
+    assert "renamed_commenter" in client.get(
+        f"/posts/{post.pk}/"
+    ).content.decode("utf-8"), (
+        "Убедитесь, что кеш страницы сбрасывается при изменении"
+        " автора комментария."
+    )
+
+
+def test_publication_clock_is_quantized_and_exact_for_scheduled_posts(
+    mixer, user, published_category
+):
+    from datetime import datetime, timedelta, timezone
+    from unittest import mock
+
+    from blog.services import get_publication_clock
+    from blog.constants import PUBLICATION_CLOCK_TICK
+
+    tick_start = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+    scheduled = tick_start + timedelta(seconds=PUBLICATION_CLOCK_TICK / 3)
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=scheduled,
+    )
+    with mock.patch("blog.services.timezone.now") as now:
+        now.return_value = tick_start + timedelta(seconds=1)
+        assert get_publication_clock() == tick_start
+        now.return_value = scheduled - timedelta(microseconds=1)
+        assert get_publication_clock() == tick_start, (
+            "Убедитесь, что часы публикации стоят на месте внутри такта."
+        )
+        now.return_value = scheduled
+        assert get_publication_clock() == scheduled, (
+            "Убедитесь, что отложенный пост появляется ровно в срок."
+        )
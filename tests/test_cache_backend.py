@@ -0,0 +1,64 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+
+BLOGICUM_DIR = Path(__file__).resolve().parent.parent / "blogicum"
+
+BUMP_SCRIPT = """
+import sys
+
+import django
+from django.conf import settings
+
+settings.configure(CACHES={"default": {
+    "BACKEND": sys.argv[1], "LOCATION": sys.argv[2],
+}})
+django.setup()
+
+from blog.caching import bump_versions
+
+bump_versions("posts")
+"""
+
+
+def test_versions_are_shared_between_processes():
+    from blog.caching import get_versions
+
+    cache_settings = settings.CACHES["default"]
+    before = get_versions("posts")["posts"]
+    subprocess.run(
+        [
+            sys.executable, "-c", BUMP_SCRIPT,
+            cache_settings["BACKEND"], str(cache_settings["LOCATION"]),
+        ],
+        cwd=BLOGICUM_DIR,
+        check=True,
+    )
+    assert get_versions("posts")["posts"] != before, (
+        "Убедитесь, что сброс версии кеша в одном процессе виден другим."
+    )
+
+
+def test_local_cache_is_reported(settings):
+    from blog.checks import check_shared_cache
+
+    assert not check_shared_cache(None)
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}
+    assert [error.id for error in check_shared_cache(None)] == ["blog.W001"]
+
+
+def test_small_file_cache_is_reported(settings):
+    from blog.checks import check_cache_entries
+
+    assert not check_cache_entries(None), (
+        "Убедитесь, что лимит записей файлового кеша увеличен в CACHES."
+    )
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": settings.CACHES["default"]["LOCATION"],
+    }}
+    assert [error.id for error in check_cache_entries(None)] == ["blog.W002"]
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comments", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев увеличивается при добавлении"
+        " комментария."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении"
+        " комментария."
+    )
+    comments[1].author.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев уменьшается при каскадном"
+        " удалении комментариев."
+    )
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    from blog.models import FeedEntry, Post
+
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comments", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+    FeedEntry.objects.filter(pk=post.pk).update(comment_count=10)
+    call_command("recount_comments", batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 2, (
+        "Убедитесь, что команда исправляет счётчик и в ленте."
+    )
+
+
+def test_post_delete_skips_comment_maintenance(
+    mixer, post_with_published_location, another_user
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def count_delete_queries(comments):
+        post = mixer.blend(
+            "blog.Post",
+            author=another_user,
+            category=post_with_published_location.category,
+        )
+        mixer.cycle(comments).blend("blog.Comments", post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        return len(queries.captured_queries)
+
+    assert count_delete_queries(1) == count_delete_queries(20), (
+        "Убедитесь, что при удалении поста комментарии не обрабатываются"
+        " по одному."
+    )
@@ -0,0 +1,99 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.pk}/",
+    )
+
+
+def test_unchanged_pages_answer_not_modified(user_client, urls):
+    for url in urls:
+        response = user_client.get(url)
+        assert response.has_header("ETag"), (
+            f"Убедитесь, что страница `{url}` отдаёт заголовок ETag."
+        )
+        assert response.has_header("Last-Modified")
+        response = user_client.get(
+            url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304, (
+            f"Убедитесь, что неизменившаяся страница `{url}` отвечает"
+            " статусом 304."
+        )
+
+
+def test_changes_invalidate_validators(
+    user_client, mixer, urls, post_with_published_location
+):
+    etags = {url: user_client.get(url)["ETag"] for url in urls}
+    mixer.blend("blog.Comments", post=post_with_published_location)
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f"Убедитесь, что после нового комментария страница `{url}`"
+            " отдаётся заново."
+        )
+
+
+def test_etag_depends_on_user(user_client, another_user_client, urls):
+    for url in urls:
+        etag = user_client.get(url)["ETag"]
+        response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+
+def test_profile_edit_invalidates_validators(
+    another_user_client, another_user, post_with_published_location
+):
+    url = f"/profile/{another_user.username}/"
+    etag = another_user_client.get(url)["ETag"]
+    another_user_client.post("/edit/", {
+        "first_name": "Новое имя",
+        "last_name": another_user.last_name,
+        "username": another_user.username,
+        "email": another_user.email,
+    })
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после изменения профиля его страница отдаётся"
+        " заново."
+    )
+    assert "Новое имя" in response.content.decode()
+
+
+def test_pages_are_revalidated(client, user_client, urls):
+    for url in urls:
+        cache_control = client.get(url)["Cache-Control"]
+        assert "no-cache" in cache_control and "private" not in (
+            cache_control
+        ), (
+            f"Убедитесь, что страница `{url}` требует проверки валидаторов"
+            " перед повторным использованием."
+        )
+        assert {"no-cache", "private"} <= {
+            part.strip()
+            for part in user_client.get(url)["Cache-Control"].split(",")
+        }, (
+            f"Убедитесь, что страница `{url}` для авторизованных"
+            " пользователей помечена как private."
+        )
+
+
+def test_etag_changes_after_login(user_client, user, urls):
+    for url in urls:
+        etag = user_client.get(url)["ETag"]
+        user_client.logout()
+        user_client.force_login(user)
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            "Убедитесь, что после повторного входа страница с формами"
+            " отдаётся заново, с новым CSRF-токеном."
+        )
@@ -0,0 +1,84 @@
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_form_data(post):
+    return {
+        "title": post.title,
+        "text": post.text,
+        "pub_date": timezone.localtime(post.pub_date).strftime(
+            "%Y-%m-%dT%H:%M"
+        ),
+        "category": post.category_id,
+        "location": post.location_id or "",
+        "is_published": True,
+    }
+
+
+def test_duplicate_post_is_rejected_by_digest(post_with_published_location):
+    from blog.forms import CreatePost
+
+    post = post_with_published_location
+    post.pub_date = post.pub_date.replace(second=0, microsecond=0)
+    post.save()
+    form = CreatePost(data=get_form_data(post))
+    with CaptureQueriesContext(connection) as queries:
+        assert not form.is_valid(), (
+            "Убедитесь, что форма не позволяет создать дубликат поста."
+        )
+    assert not any(
+        '"blog_post"."text" =' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что дубликаты ищутся по отпечатку, а не по тексту."
+
+    form = CreatePost(data=get_form_data(post), instance=post)
+    assert form.is_valid(), (
+        "Убедитесь, что пост можно сохранить без изменений."
+    )
+
+
+def test_digest_is_unique_in_database(mixer, post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    assert post.content_digest
+    duplicate = Post(
+        title=post.title,
+        text=post.text,
+        pub_date=post.pub_date,
+        category=post.category,
+        location=post.location,
+        author=post.author,
+    )
+    with pytest.raises(IntegrityError), transaction.atomic():
+        duplicate.save()
+    duplicate.text += " "
+    duplicate.save()
+    assert duplicate.content_digest != post.content_digest
+
+
+def test_admin_reports_duplicate_post(
+    admin_client, post_with_published_location
+):
+    from blog.models import Post
+
+    post = post_with_published_location
+    post.pub_date = post.pub_date.replace(second=0, microsecond=0)
+    post.save()
+    data = get_form_data(post)
+    local_pub_date = timezone.localtime(post.pub_date)
+    data.update({
+        "author": post.author_id,
+        "pub_date_0": local_pub_date.strftime("%Y-%m-%d"),
+        "pub_date_1": local_pub_date.strftime("%H:%M:%S"),
+    })
+    response = admin_client.post("/admin/blog/post/add/", data)
+    assert response.status_code == 200, (
+        "Убедитесь, что админка показывает ошибку формы для дубликата поста."
+    )
+    assert "Такой пост уже существует" in response.content.decode()
+    assert Post.objects.count() == 1
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer):
+    category = mixer.blend("blog.Category", is_published=True)
+    return mixer.cycle(3).blend(
+        "blog.Post",
+        category=category,
+        is_published=True,
+        pub_date=(
+            timezone.now() - timedelta(days=days) for days in (1, 10, 20)
+        ),
+    )
+
+
+def test_admin_action_streams_csv(admin_client, posts):
+    response = admin_client.post("/admin/blog/post/", {
+        "action": "export_csv",
+        "index": 0,
+        "_selected_action": [post.pk for post in posts],
+    })
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся через `StreamingHttpResponse`."
+    )
+    rows = list(csv.DictReader(io.StringIO(
+        b"".join(response.streaming_content).decode()
+    )))
+    assert [int(row["id"]) for row in rows] == sorted(
+        post.pk for post in posts
+    )
+    assert rows[0]["author__username"] == posts[0].author.username
+
+
+def test_admin_action_streams_jsonl(admin_client, mixer, posts):
+    comment = mixer.blend("blog.Comments", post=posts[0])
+    response = admin_client.post("/admin/blog/comments/", {
+        "action": "export_jsonl",
+        "index": 0,
+        "_selected_action": [comment.pk],
+    })
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["text"] for line in lines] == [comment.text]
+
+
+def test_export_command_filters(posts):
+    out = io.StringIO()
+    call_command(
+        "export_blog", "post",
+        "--date-from", str((timezone.now() - timedelta(days=15)).date()),
+        "--author", posts[1].author.username,
+        stdout=out,
+    )
+    lines = out.getvalue().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [posts[1].pk], (
+        "Убедитесь, что команда `export_blog` учитывает фильтры по дате и"
+        " автору."
+    )
+
+
+def test_export_command_writes_file(posts, tmp_path):
+    output = tmp_path / "posts.csv"
+    call_command(
+        "export_blog", "post", "--format", "csv",
+        "--category", posts[0].category.slug, "--output", str(output),
+        stderr=io.StringIO(),
+    )
+    rows = list(csv.DictReader(output.open(encoding="utf-8")))
+    assert len(rows) == 3
@@ -0,0 +1,111 @@
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_is_served_from_feed_table(
+    user_client, post_with_published_location
+):
+    with mock.patch(
+        "blog.services.timezone.now", return_value=timezone.now()
+    ):
+        user_client.get("/")
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get("/")
+    assert post_with_published_location.title in response.content.decode(
+        "utf-8"
+    )
+    assert not any(
+        '"blog_post"."title"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что главная страница читает посты из таблицы ленты."
+
+
+def test_feed_follows_changes(mixer, post_with_published_location):
+    from blog.models import FeedEntry
+
+    post = post_with_published_location
+    entry = FeedEntry.objects.get(pk=post.pk)
+    assert entry.category_title == post.category.title
+
+    mixer.blend("blog.Comments", post=post)
+    post.location.name = "Новое место"
+    post.location.save()
+    post.author.username = "new_author"
+    post.author.save()
+    entry.refresh_from_db()
+    assert entry.comment_count == 1
+    assert entry.location_name == "Новое место"
+    assert entry.author_username == "new_author"
+
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что снятый с публикации пост удаляется из ленты."
+    )
+
+
+def test_rebuild_feed(post_with_published_location):
+    from blog.models import FeedEntry
+
+    FeedEntry.objects.all().delete()
+    call_command("rebuild_feed")
+    assert FeedEntry.objects.filter(
+        pk=post_with_published_location.pk
+    ).exists()
+
+
+def test_feed_entries_are_fast_deleted(post_with_published_location):
+    from blog.models import FeedEntry
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("rebuild_feed")
+    assert not any(
+        '"blog_feedentry"."title"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что записи ленты удаляются без загрузки в память."
+    assert FeedEntry.objects.filter(
+        pk=post_with_published_location.pk
+    ).exists()
+
+
+def test_deleted_post_leaves_cached_feed(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode("utf-8")
+    post.delete()
+    assert post.title not in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что удалённый пост пропадает из закешированной ленты."
+    )
+
+
+def test_category_rename_updates_feed_in_place(post_with_published_location):
+    from blog.models import FeedEntry
+
+    post = post_with_published_location
+    category = post.category
+    category.description = "Новое описание"
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    assert not any(
+        "blog_feedentry" in query["sql"] for query in queries.captured_queries
+    ), "Убедитесь, что правка описания категории не трогает ленту."
+
+    category.title = "Новое название"
+    category.slug = "new-slug"
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    entry = FeedEntry.objects.get(pk=post.pk)
+    assert (entry.category_title, entry.category_slug) == (
+        "Новое название", "new-slug"
+    )
+    assert sum(
+        "blog_feedentry" in query["sql"] for query in queries.captured_queries
+    ) == 1, "Убедитесь, что название категории в ленте меняется одним UPDATE."
@@ -0,0 +1,162 @@
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+@pytest.fixture
+def upload(django_capture_on_commit_callbacks):
+    def save(post, image):
+        post.image = image
+        with django_capture_on_commit_callbacks(execute=True):
+            post.save()
+
+    return save
+
+
+def make_image(size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "teal").save(buffer, "PNG")
+    return SimpleUploadedFile(
+        "photo.png", buffer.getvalue(), content_type="image/png"
+    )
+
+
+def test_variants_are_generated_on_upload(
+    upload, post_with_published_location
+):
+    post = post_with_published_location
+    upload(post, make_image())
+    variants = list(post.image_variants.order_by("content_type", "width"))
+    assert {
+        (variant.content_type, variant.width, variant.height)
+        for variant in variants
+    } == {
+        (content_type, width, round(900 * width / 1600))
+        for content_type in ("image/jpeg", "image/webp")
+        for width in (320, 640, 1280)
+    }, "Убедитесь, что для изображения создаются уменьшенные копии и WebP."
+    for variant in variants:
+        with Image.open(variant.image.path) as image:
+            assert image.size == (variant.width, variant.height)
+
+    post.title += " edited"
+    post.save()
+    assert [
+        variant.pk for variant in post.image_variants.order_by(
+            "content_type", "width"
+        )
+    ] == [variant.pk for variant in variants], (
+        "Убедитесь, что варианты не пересоздаются без смены изображения."
+    )
+
+
+def test_cards_render_srcset(
+    upload, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    upload(post, make_image((400, 300)))
+    for url in ("/", f"/category/{post.category.slug}/", f"/posts/{post.pk}/"):
+        content = user_client.get(url).content.decode()
+        assert 'srcset="' in content and 'width="400"' in content, (
+            f"Убедитесь, что на странице `{url}` изображение выводится"
+            " с srcset и размерами."
+        )
+        assert 'type="image/webp"' in content
+
+
+def test_placeholder_until_variants_are_ready(
+    django_capture_on_commit_callbacks, user_client,
+    post_with_published_location
+):
+    post = post_with_published_location
+    post.image = make_image()
+    with django_capture_on_commit_callbacks() as callbacks:
+        post.save()
+    url = f"/posts/{post.pk}/"
+    content = user_client.get(url).content.decode()
+    assert "Изображение обрабатывается" in content, (
+        "Убедитесь, что до готовности уменьшенных копий выводится заглушка."
+    )
+    assert f'src="{post.image.url}"' not in content
+    for callback in callbacks:
+        callback()
+    content = user_client.get(url).content.decode()
+    assert "Изображение обрабатывается" not in content
+    assert 'srcset="' in content
+
+
+def test_backfill_command(post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    post.image_variants.all().delete()
+    Post.objects.filter(pk=post.pk).update(
+        image=post.image.storage.save("photo.png", make_image())
+    )
+    call_command("generate_image_variants")
+    assert post.image_variants.count() == 6, (
+        "Убедитесь, что команда создаёт варианты для существующих постов."
+    )
+
+
+def test_original_is_stored_without_exif(
+    upload, post_with_published_location
+):
+    from blog.models import FeedEntry, MediaBlob
+
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    exif[0x8825] = {1: "N", 2: (55.0, 45.0, 0.0)}
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600), "teal").save(
+        buffer, "JPEG", exif=exif.tobytes()
+    )
+    post = post_with_published_location
+    upload(post, SimpleUploadedFile(
+        "photo.jpg", buffer.getvalue(), content_type="image/jpeg"
+    ))
+    uploaded = post.image.name
+    post.refresh_from_db()
+    assert post.image.name != uploaded
+    with Image.open(post.image.path) as image:
+        assert "exif" not in image.info and not image.getexif(), (
+            "Убедитесь, что из сохранённого оригинала удаляются EXIF и"
+            " координаты съёмки."
+        )
+    assert not post.image.storage.exists(uploaded), (
+        "Убедитесь, что исходный файл с EXIF удаляется."
+    )
+    assert MediaBlob.objects.get(name=post.image.name).refcount == 1
+    assert not MediaBlob.objects.filter(name=uploaded).exists()
+    assert {
+        variant.source for variant in post.image_variants.all()
+    } == {post.image.name}
+    assert FeedEntry.objects.get(pk=post.pk).image == post.image.name
+
+
+def test_thread_executor_drains_jobs():
+    from blog.executors import ThreadExecutor
+
+    executor = ThreadExecutor(max_workers=2)
+    threads = []
+
+    def job(number):
+        time.sleep(0.01)
+        threads.append((number, threading.current_thread().name))
+
+    futures = [executor.submit(job, number) for number in range(10)]
+    executor.shutdown()
+    assert all(future.done() for future in futures), (
+        "Убедитесь, что ThreadExecutor.shutdown() дожидается всех задач."
+    )
+    assert sorted(number for number, _ in threads) == list(range(10))
+    assert all(name.startswith("blog-images") for _, name in threads), (
+        "Убедитесь, что задачи выполняются в фоновых потоках."
+    )
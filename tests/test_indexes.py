@@ -0,0 +1,102 @@
+import re
+
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Планы запросов проверяются на SQLite.",
+    ),
+]
+
+
+def assert_uses_index(queryset, table, index_name):
+    plan = queryset.explain()
+    assert f"USING INDEX {index_name}" in plan, (
+        f"Убедитесь, что запрос к `{table}` использует индекс"
+        f" `{index_name}`:\n{plan}"
+    )
+    assert not re.search(rf"SCAN {table}(?! USING)", plan), (
+        f"Убедитесь, что запрос не просматривает таблицу `{table}`"
+        f" целиком:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        f"Убедитесь, что сортировка выполняется по индексу:\n{plan}"
+    )
+
+
+@pytest.fixture
+def feed_queryset():
+    from blog.services import (
+        filter_posts_by_publication,
+        get_select_related,
+        sort_posts,
+    )
+
+    def build(queryset, published=True):
+        queryset = get_select_related(sort_posts(queryset))
+        if published:
+            queryset = filter_posts_by_publication(queryset)
+        return queryset.order_by("-pub_date", "-pk")[:11]
+
+    return build
+
+
+def test_feed_uses_index(feed_queryset, post_with_published_location):
+    from blog.models import Post
+
+    assert_uses_index(
+        feed_queryset(Post.objects.all()), "blog_post", "post_live_feed_idx"
+    )
+
+
+def test_category_feed_uses_index(
+    feed_queryset, post_with_published_location
+):
+    category = post_with_published_location.category
+    assert_uses_index(
+        feed_queryset(category.posts.all()),
+        "blog_post",
+        "post_live_category_feed_idx",
+    )
+
+
+def test_profile_uses_index(feed_queryset, user, post_with_published_location):
+    for published in (True, False):
+        assert_uses_index(
+            feed_queryset(user.posts.all(), published),
+            "blog_post",
+            "post_author_feed_idx",
+        )
+
+
+def test_comments_use_index(post_with_published_location):
+    assert_uses_index(
+        post_with_published_location.comments.select_related("author"),
+        "blog_comments",
+        "comment_post_created_idx",
+    )
+
+
+def test_admin_post_keyset_uses_index(post_with_published_location):
+    from blog.models import Post
+
+    assert_uses_index(
+        Post.objects.select_related("author", "category", "location")
+        .order_by("-pub_date", "-pk")[:101],
+        "blog_post",
+        "post_pub_date_idx",
+    )
+
+
+def test_admin_comments_keyset_uses_index(comment):
+    from blog.models import Comments
+
+    assert_uses_index(
+        Comments.objects.select_related("author", "post")
+        .order_by("-created_at", "-pk")[:101],
+        "blog_comments",
+        "comment_created_idx",
+    )
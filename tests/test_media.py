@@ -0,0 +1,80 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_url(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "files").mkdir()
+    (tmp_path / "files" / "data.bin").write_bytes(CONTENT)
+    return "/media/files/data.bin"
+
+
+def get_content(response):
+    return b"".join(response.streaming_content)
+
+
+def test_full_response_has_validators(client, media_url):
+    response = client.get(media_url)
+    assert response.status_code == 200
+    assert get_content(response) == CONTENT
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["ETag"].startswith('"'), (
+        "Убедитесь, что медиафайлы отдаются со строгим ETag."
+    )
+    assert response.has_header("Last-Modified")
+    response = client.get(media_url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившийся файл отвечает статусом 304."
+    )
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [
+        ("bytes=0-9", 0, 9),
+        ("bytes=1000-", 1000, 1023),
+        ("bytes=-4", 1020, 1023),
+    ],
+)
+def test_range_requests(client, media_url, header, start, end):
+    response = client.get(media_url, HTTP_RANGE=header)
+    assert response.status_code == 206, (
+        "Убедитесь, что медиафайлы поддерживают запросы диапазонов."
+    )
+    assert response["Content-Range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert get_content(response) == CONTENT[start:end + 1]
+
+
+def test_bad_ranges(client, media_url):
+    response = client.get(media_url, HTTP_RANGE="bytes=5000-")
+    assert response.status_code == 416
+    response = client.get(
+        media_url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что при несовпадении If-Range отдаётся весь файл."
+    )
+
+
+@pytest.mark.parametrize(
+    "offload, header",
+    [("x-accel-redirect", "X-Accel-Redirect"), ("x-sendfile", "X-Sendfile")],
+)
+def test_offload_to_front_server(client, settings, media_url, offload, header):
+    settings.BLOG_MEDIA_OFFLOAD = offload
+    response = client.get(media_url)
+    assert response.status_code == 200
+    assert response[header].endswith("files/data.bin"), (
+        "Убедитесь, что отдачу файла можно передать фронтенд-серверу."
+    )
+    assert response.content == b""
+
+
+def test_missing_and_outside_files(client, media_url):
+    assert client.get("/media/files/missing.bin").status_code == 404
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/files/").status_code == 404
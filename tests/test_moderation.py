@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blend_posts(mixer):
+    def blend(count, **fields):
+        category = mixer.blend("blog.Category", is_published=True)
+        location = mixer.blend("blog.Location", is_published=True)
+        posts = mixer.cycle(count).blend("blog.Post", **{
+            "category": category,
+            "location": location,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            **fields,
+        })
+        for post in posts:
+            mixer.cycle(2).blend("blog.Comments", post=post)
+        return posts
+
+    return blend
+
+
+def run_action(client, model, action, objects, confirm=True):
+    data = {
+        "action": action,
+        "index": 0,
+        "_selected_action": [obj.pk for obj in objects],
+    }
+    if confirm:
+        data["post"] = "yes"
+    return client.post(f"/admin/blog/{model}/", data)
+
+
+def test_unpublish_and_publish_posts(admin_client, blend_posts):
+    from blog.models import FeedEntry, Post
+
+    posts = blend_posts(3)
+    response = run_action(admin_client, "post", "unpublish_selected", posts)
+    assert response.status_code == 302
+    assert not Post.objects.filter(is_live=True).exists(), (
+        "Убедитесь, что действие снятия с публикации обновляет `is_live`."
+    )
+    assert not FeedEntry.objects.exists(), (
+        "Убедитесь, что снятые с публикации посты удаляются из ленты."
+    )
+    run_action(admin_client, "post", "publish_selected", posts)
+    assert Post.objects.filter(is_live=True).count() == 3
+    assert FeedEntry.objects.count() == 3, (
+        "Убедитесь, что опубликованные посты возвращаются в ленту."
+    )
+
+
+def test_purge_posts_uses_constant_queries(admin_client, blend_posts):
+    from blog.models import Comments, FeedEntry, Post
+
+    posts = blend_posts(2)
+    with CaptureQueriesContext(connection) as queries:
+        run_action(admin_client, "post", "purge_selected", posts)
+    expected = len(queries.captured_queries)
+    posts = blend_posts(10)
+    with CaptureQueriesContext(connection) as queries:
+        run_action(admin_client, "post", "purge_selected", posts)
+    assert len(queries.captured_queries) == expected, (
+        "Убедитесь, что удаление постов выполняется без поштучной обработки."
+    )
+    assert not Post.objects.exists()
+    assert not Comments.objects.exists()
+    assert not FeedEntry.objects.exists()
+
+
+def test_purge_requires_confirmation(admin_client, blend_posts):
+    from blog.models import Post
+
+    posts = blend_posts(2)
+    response = run_action(
+        admin_client, "post", "purge_selected", posts, confirm=False
+    )
+    assert response.status_code == 200
+    assert Post.objects.count() == 2, (
+        "Убедитесь, что удаление требует подтверждения."
+    )
+
+
+def test_purge_comments_keeps_counters(admin_client, blend_posts):
+    from blog.models import FeedEntry
+
+    post = blend_posts(1)[0]
+    comment = post.comments.first()
+    run_action(admin_client, "comments", "purge_selected", [comment])
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментариев пересчитывает их число у поста."
+    )
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 1
+
+
+def test_unpublish_category_hides_posts(admin_client, blend_posts):
+    from blog.models import FeedEntry, Post
+
+    post = blend_posts(2)[0]
+    run_action(
+        admin_client, "category", "unpublish_selected", [post.category]
+    )
+    assert not Post.objects.filter(is_live=True).exists()
+    assert not FeedEntry.objects.exists()
+    run_action(admin_client, "category", "publish_selected", [post.category])
+    assert FeedEntry.objects.count() == 2, (
+        "Убедитесь, что публикация категории возвращает её посты в ленту."
+    )
+
+
+def test_unpublish_location_clears_feed(admin_client, blend_posts):
+    from blog.models import FeedEntry
+
+    post = blend_posts(1)[0]
+    run_action(
+        admin_client, "location", "unpublish_selected", [post.location]
+    )
+    assert FeedEntry.objects.get(pk=post.pk).location_name == ""
+    run_action(admin_client, "location", "publish_selected", [post.location])
+    assert FeedEntry.objects.get(pk=post.pk).location_name == (
+        post.location.name
+    )
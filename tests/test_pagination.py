@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=i // 2) for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def test_cursor_pagination_walks_feed(user_client, feed_posts):
+    expected = sorted(
+        feed_posts, key=lambda post: (post.pub_date, post.pk), reverse=True
+    )
+    seen = []
+    url = "/"
+    while url:
+        page_obj = user_client.get(url).context["page_obj"]
+        seen.extend(page_obj)
+        url = (
+            f"/?cursor={page_obj.next_cursor}" if page_obj.has_next() else None
+        )
+    assert [post.pk for post in seen] == [post.pk for post in expected], (
+        "Убедитесь, что курсорная пагинация проходит ленту целиком, "
+        "без пропусков и повторов."
+    )
+
+    first_page = user_client.get("/").context["page_obj"]
+    last_page = user_client.get(
+        f"/?cursor={first_page.last_cursor}"
+    ).context["page_obj"]
+    previous_page = user_client.get(
+        f"/?cursor={last_page.previous_cursor}"
+    ).context["page_obj"]
+    assert [post.pk for post in last_page] == [
+        post.pk for post in expected[-N_PER_PAGE:]
+    ], "Убедитесь, что ссылка на последнюю страницу ведёт в конец ленты."
+    assert [post.pk for post in previous_page] == [
+        post.pk for post in expected[-N_PER_PAGE * 2:-N_PER_PAGE]
+    ], "Убедитесь, что по курсорной пагинации можно листать назад."
+
+
+def test_old_page_links_still_work(client, feed_posts):
+    response = client.get("/?page=2")
+    assert response.status_code == 200
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 2
+    assert len(page_obj) == N_PER_PAGE
+
+
+def test_old_page_links_reach_the_end(client, feed_posts):
+    response = client.get("/?page=3")
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 3, (
+        "Убедитесь, что нумерованные ссылки ведут на все страницы ленты, а"
+        " не обрезаются приблизительным количеством."
+    )
+    assert page_obj.paginator.count == len(feed_posts)
+
+
+def test_broken_cursor_falls_back_to_first_page(client, feed_posts):
+    response = client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+def test_page_count_is_cached_and_invalidated(
+    another_user_client, mixer, user, feed_posts, published_category
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    url = f"/profile/{user.username}/"
+    another_user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        page_obj = another_user_client.get(url).context["page_obj"]
+    assert not any(
+        "SELECT COUNT(*)" in query["sql"] for query in queries.captured_queries
+    ), "Убедитесь, что количество публикаций берётся из кеша."
+    assert page_obj.paginator.count == len(feed_posts)
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    page_obj = another_user_client.get(url).context["page_obj"]
+    assert page_obj.paginator.count == len(feed_posts) + 1, (
+        "Убедитесь, что кеш количества публикаций сбрасывается "
+        "при изменении постов."
+    )
+
+
+def test_comments_are_paginated_and_loaded_lazily(
+    user_client, mixer, post_with_published_location
+):
+    from blog.constants import COMMENTS_PAGINATION_COUNT
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PAGINATION_COUNT * 2 + 3).blend(
+        "blog.Comments", post=post
+    )
+    page = user_client.get(f"/posts/{post.pk}/").context["comments"]
+    assert len(page) == COMMENTS_PAGINATION_COUNT, (
+        "Убедитесь, что на странице поста выводится ограниченное число"
+        " комментариев."
+    )
+    seen = list(page)
+    while page.has_next():
+        response = user_client.get(
+            f"/posts/{post.pk}/comments/?cursor={page.next_cursor}"
+        )
+        assert response.status_code == 200
+        assert "<html" not in response.content.decode(), (
+            "Убедитесь, что подгрузка комментариев отдаёт фрагмент страницы."
+        )
+        page = response.context["comments"]
+        seen.extend(page)
+    assert [comment.pk for comment in seen] == [
+        comment.pk for comment in comments
+    ], (
+        "Убедитесь, что подгрузка комментариев проходит их по порядку,"
+        " без пропусков и повторов."
+    )
+
+
+def test_comments_fragment_hides_unpublished_post(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.pk}/comments/")
+    assert response.status_code == 404
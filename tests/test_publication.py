@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_is_live_follows_post_and_category(post_with_published_location):
+    post = post_with_published_location
+    assert post.is_live
+
+    post.category.is_published = False
+    post.category.save()
+    post.refresh_from_db()
+    assert not post.is_live, (
+        "Убедитесь, что пост пропадает из ленты, когда его категорию"
+        " снимают с публикации."
+    )
+
+    post.category.is_published = True
+    post.category.save()
+    post.refresh_from_db()
+    assert post.is_live
+
+    post.is_published = False
+    post.save()
+    assert not post.is_live
+
+
+def test_scheduled_post_goes_live(user_client, future_posts):
+    from blog.models import Post
+
+    call_command("publish_scheduled", once=True)
+    assert not Post.objects.filter(is_live=True).exists(), (
+        "Убедитесь, что отложенные посты не попадают в ленту раньше срока."
+    )
+    Post.objects.update(pub_date=timezone.now() - timedelta(minutes=1))
+    call_command("publish_scheduled", once=True)
+    assert Post.objects.filter(is_live=True).count() == len(future_posts), (
+        "Убедитесь, что отложенные посты попадают в ленту, когда наступает"
+        " их время."
+    )
+
+
+def test_views_publish_due_posts_without_worker(
+    client, future_posts, published_category
+):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from blog.feed import get_feed_entries
+    from blog.models import Post
+    from blog.services import filter_posts_by_publication
+
+    Post.objects.update(
+        pub_date=timezone.now() - timedelta(minutes=1),
+        is_published=True,
+        category=published_category,
+    )
+    with CaptureQueriesContext(connection) as queries:
+        assert not list(filter_posts_by_publication(Post.objects))
+        assert not list(get_feed_entries())
+    assert not any(
+        query["sql"].startswith("UPDATE") for query in queries.captured_queries
+    ), "Убедитесь, что функции чтения ленты не изменяют посты."
+    # Метка такта из предыдущих тестов иначе отменит публикацию.
+    cache.clear()
+    assert client.get("/").status_code == 200
+    assert Post.objects.filter(is_live=True).count() == len(future_posts), (
+        "Убедитесь, что страницы ленты публикуют наступившие отложенные"
+        " посты, даже если воркер не запущен."
+    )
+
+
+def test_category_edit_keeps_posts_untouched(post_with_published_location):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    category = post_with_published_location.category
+    category.description = "Новое описание"
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    assert not any(
+        query["sql"].startswith('UPDATE "blog_post"')
+        for query in queries.captured_queries
+    ), (
+        "Убедитесь, что правка описания категории не переписывает её посты."
+    )
@@ -0,0 +1,122 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_post_selects(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+
+
+def test_post_excerpt(mixer, user):
+    post = mixer.blend("blog.Post", author=user, text=" ".join(["слово"] * 50))
+    assert post.excerpt == " ".join(["слово"] * 10) + " …"
+
+
+def test_list_views_do_not_load_post_text(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        for sql in get_post_selects(user_client, url):
+            assert '"blog_post"."text"' not in sql, (
+                f"Убедитесь, что страница `{url}` не загружает полный текст"
+                " публикаций."
+            )
+
+
+def test_fill_excerpts_command(post_with_published_location):
+    from blog.models import FeedEntry, Post
+
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(excerpt="")
+    call_command("fill_excerpts")
+    post.refresh_from_db()
+    assert post.excerpt
+    assert FeedEntry.objects.get(pk=post.pk).excerpt == post.excerpt
+
+
+UNNEEDED_COLUMNS = (
+    '"auth_user"."password"',
+    '"auth_user"."email"',
+    '"auth_user"."last_login"',
+    '"auth_user"."is_superuser"',
+    '"blog_category"."description"',
+    '"blog_category"."created_at"',
+    '"blog_location"."created_at"',
+    '"blog_post"."created_at"',
+)
+
+
+def get_selects(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+    ]
+
+
+def test_views_load_only_needed_columns(
+    client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comments", post=post)
+    for url in (
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.pk}/",
+    ):
+        for sql in get_selects(client, url):
+            for column in UNNEEDED_COLUMNS:
+                if column == '"blog_category"."description"' and (
+                    url.startswith("/category/")
+                    and 'FROM "blog_category"' in sql
+                ):
+                    continue
+                assert column not in sql, (
+                    f"Убедитесь, что страница `{url}` не загружает"
+                    f" столбец {column}:\n{sql}"
+                )
+
+
+def test_projections_do_not_cause_extra_queries(
+    user_client, mixer, user, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    mixer.cycle(3).blend("blog.Comments", post=post)
+    urls = (
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{post.pk}/",
+    )
+    counts = [len(get_selects(user_client, url)) for url in urls]
+    mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+    )
+    mixer.cycle(5).blend("blog.Comments", post=post)
+    assert [len(get_selects(user_client, url)) for url in urls] == counts, (
+        "Убедитесь, что шаблоны не обращаются к незагруженным полям"
+        " и число запросов не растёт вместе с числом постов."
+    )
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        fields.update(kwargs)
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+
+    return {
+        "title": blend("Горные вершины", "Описание похода."),
+        "text": blend("Заметка", "Поднимались на вершины Кавказа."),
+        "other": blend("Рецепт", "Пирог с яблоками."),
+        "hidden": blend("Скрытые вершины", "Текст.", is_published=False),
+        "future": blend(
+            "Будущие вершины", "Текст.",
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+    }
+
+
+def get_found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.pk for post in response.context["page_obj"]]
+
+
+def test_search_ranks_published_posts(user_client, posts):
+    assert get_found(user_client, "вершин") == [
+        posts["title"].pk, posts["text"].pk
+    ], (
+        "Убедитесь, что поиск находит только опубликованные посты и выше"
+        " ставит совпадения в заголовке."
+    )
+    assert get_found(user_client, "") == []
+
+
+def test_search_index_follows_edits(user_client, posts):
+    post = posts["other"]
+    post.text = "Пирог с вишней."
+    post.save()
+    assert get_found(user_client, "вишней") == [post.pk], (
+        "Убедитесь, что индекс поиска обновляется при изменении поста."
+    )
+    assert get_found(user_client, "яблоками") == []
+    post.delete()
+    assert get_found(user_client, "вишней") == []
+
+
+def test_search_results_use_cursor(user_client, mixer, user, posts):
+    found = mixer.cycle(N_PER_PAGE + 3).blend(
+        "blog.Post",
+        author=user,
+        category=posts["other"].category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        text="Общий текст про озеро.",
+    )
+    response = user_client.get("/search/", {"q": "озеро"})
+    page_obj = response.context["page_obj"]
+    seen = [post.pk for post in page_obj]
+    assert "q=%D0%BE%D0%B7%D0%B5%D1%80%D0%BE&amp;cursor=" in (
+        response.content.decode()
+    ), "Убедитесь, что ссылки пагинации поиска сохраняют запрос."
+    seen += [
+        post.pk for post in user_client.get(
+            "/search/", {"q": "озеро", "cursor": page_obj.next_cursor}
+        ).context["page_obj"]
+    ]
+    assert sorted(seen) == sorted(post.pk for post in found)
+
+
+def test_admin_search_uses_index(admin_client, posts):
+    response = admin_client.get(
+        "/admin/blog/post/", {"q": "вершин"}
+    )
+    assert response.status_code == 200
+    assert {post.pk for post in response.context["cl"].result_list} == {
+        posts["title"].pk, posts["text"].pk, posts["hidden"].pk,
+        posts["future"].pk,
+    }
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="Полнотекстовый индекс есть только в SQLite.",
+)
+def test_search_matches_index_once(posts):
+    from django.db.models import Q
+
+    from blog.models import Post
+    from blog.search import search_posts
+    from blog.services import filter_posts_by_publication, get_post_cards
+
+    queryset = search_posts(
+        get_post_cards(filter_posts_by_publication(Post.objects)), "вершин"
+    )
+    plan = queryset.filter(
+        Q(rank__gt=-1.0) | Q(rank=-1.0, pk__gt=0)
+    ).order_by("rank", "pk")[:11].explain()
+    assert "CORRELATED" not in plan and plan.count("VIRTUAL TABLE") == 1, (
+        "Убедитесь, что поиск обращается к полнотекстовому индексу один раз,"
+        f" без коррелированных подзапросов:\n{plan}"
+    )
@@ -0,0 +1,97 @@
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_image(name="photo.png", color="teal"):
+    buffer = BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+    return SimpleUploadedFile(
+        name, buffer.getvalue(), content_type="image/png"
+    )
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, django_capture_on_commit_callbacks):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category, image=None
+    )
+    for post, name in zip(posts, ("first.png", "second.PNG")):
+        post.image = make_image(name)
+        with django_capture_on_commit_callbacks(execute=True):
+            post.save()
+    return posts
+
+
+def test_identical_images_share_one_blob(posts, media_root):
+    from blog.models import MediaBlob
+
+    first, second = posts
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    )
+    assert re.fullmatch(
+        r"images/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.png",
+        first.image.name,
+    ), "Убедитесь, что имя файла строится по хешу содержимого."
+    assert len(list((media_root / "images").rglob("*.png"))) == 1
+    assert MediaBlob.objects.get(name=first.image.name).refcount == 2
+
+
+def test_blob_is_deleted_with_last_reference(
+    posts, media_root, django_capture_on_commit_callbacks
+):
+    from blog.models import MediaBlob
+
+    first, second = posts
+    path = media_root / first.image.name
+    variants = [
+        media_root / variant.image.name
+        for variant in first.image_variants.all()
+    ]
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert variants and not any(variant.exists() for variant in variants), (
+        "Убедитесь, что варианты изображения удаляются вместе с постом."
+    )
+    assert path.exists(), (
+        "Убедитесь, что файл не удаляется, пока на него ссылаются посты."
+    )
+    second.image = make_image(color="navy")
+    with django_capture_on_commit_callbacks(execute=True):
+        second.save()
+    assert not path.exists(), (
+        "Убедитесь, что файл удаляется, когда на него не осталось ссылок."
+    )
+    assert not MediaBlob.objects.filter(name=first.image.name).exists()
+
+
+def test_blobs_are_served_as_immutable(posts, client):
+    response = client.get(posts[0].image.url)
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что медиафайлы отдаются с заголовком immutable."
+    )
+
+
+def test_dedupe_media_moves_legacy_files(
+    mixer, user, published_category, media_root
+):
+    from blog.models import MediaBlob, Post
+
+    posts = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category, image=None
+    )
+    for post, name in zip(posts, ("legacy_a.png", "legacy_b.png")):
+        (media_root / name).write_bytes(make_image().read())
+        Post.objects.filter(pk=post.pk).update(image=name)
+    call_command("dedupe_media")
+    names = set(Post.objects.values_list("image", flat=True))
+    assert len(names) == 1 and names.pop().startswith("images/")
+    assert not (media_root / "legacy_a.png").exists()
+    assert MediaBlob.objects.get().refcount == 2